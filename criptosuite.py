@@ -1,14 +1,160 @@
-import tkinter as tk
-from tkinter import ttk, font, messagebox
+import argparse
+import base64
+import hashlib
+import io
+import itertools
+import json
 import math
-import random
+import mmap
+import os
+import re
+import secrets
+import string
+import struct
+import sys
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from contextlib import nullcontext
+
+# NumPy es opcional y se importa solo cuando un texto es lo bastante grande para usarlo
+_np = False
+
+def _numpy():
+    global _np
+    if _np is False:
+        try:
+            import numpy
+            _np = numpy
+        except ImportError:
+            _np = None
+    return _np
+
+# Instrumentación opcional: las operaciones suman contadores solo cuando instrument() tiene un
+# registro activo en el hilo actual; sin él, _count no hace nada.
+_active = threading.local()
+
+def _count(name, n=1):
+    record = getattr(_active, 'record', None)
+    if record is not None:
+        counters = record['counters']
+        counters[name] = counters.get(name, 0) + n
+
+def instrument(op, func, *args, profile=False, log=None, **kwargs):
+    # Ejecuta func(*args, **kwargs) y devuelve (resultado, registro) con el tiempo, los
+    # contadores de la operación y el tamaño de la traza. profile=True adjunta un cProfile
+    # ('profile') y log, un archivo abierto, recibe el registro como una línea JSON.
+    record = {'op': op, 'ok': True, 'seconds': 0.0, 'counters': {}, 'steps': None}
+    previous = getattr(_active, 'record', None)
+    _active.record = record
+    profiler = None
+    if profile:
+        # cProfile y pstats se importan solo al perfilar: cuestan casi la mitad de importar el módulo
+        import cProfile
+        profiler = cProfile.Profile()
+    start = time.perf_counter()
+    try:
+        result = profiler.runcall(func, *args, **kwargs) if profiler else func(*args, **kwargs)
+        steps = result.get('steps') if isinstance(result, dict) else None
+        if isinstance(steps, (list, StepRecords)):
+            record['steps'] = len(steps)
+        return result, record
+    except BaseException as e:
+        record['ok'], record['error'] = False, str(e) or type(e).__name__
+        raise
+    finally:
+        record['seconds'] = time.perf_counter() - start
+        _active.record = previous
+        if previous is not None:
+            for name, n in record['counters'].items():
+                previous['counters'][name] = previous['counters'].get(name, 0) + n
+        if profiler:
+            record['profile'] = profiler
+        if log is not None:
+            log.write(json.dumps({k: v for k, v in record.items() if k != 'profile'}) + '\n')
+            log.flush()
+
+def format_stats(record):
+    # Línea de estado legible: tiempo, volumen procesado, exponenciaciones y pasos
+    parts = [f"{record['seconds']:.3f} s"]
+    counters = record['counters']
+    chars = counters.get('chars')
+    if chars:
+        rate = chars / record['seconds'] if record['seconds'] else 0
+        parts.append(f"{chars:,} caracteres ({rate / 1e6:,.1f} M/s)")
+    labels = {'modexp': 'exp. modulares', 'blocks': 'bloques', 'congruences': 'congruencias',
+              'egcd': 'llamadas a egcd', 'primality_tests': 'tests de primalidad', 'keys_scored': 'llaves evaluadas',
+              'cache_hits': 'aciertos de caché', 'cache_misses': 'fallos de caché', 'records': 'registros'}
+    for name, label in labels.items():
+        if counters.get(name):
+            parts.append(f"{counters[name]:,} {label}")
+    for name, n in counters.items():
+        if name != 'chars' and name not in labels:
+            parts.append(f"{name}={n:,}")
+    parts.append("pasos diferidos" if record['steps'] is None else f"{record['steps']:,} pasos")
+    if not record['ok']:
+        parts.append(f"error: {record.get('error')}")
+    return "  ·  ".join(parts)
+
+def profile_report(record, limit=25):
+    # Funciones con más tiempo acumulado del cProfile de un registro (instrument(profile=True))
+    import pstats
+    out = io.StringIO()
+    pstats.Stats(record['profile'], stream=out).sort_stats('cumulative').print_stats(limit)
+    return out.getvalue()
 
 # =================================================================================================
 # SECCIÓN 1: LÓGICA CRIPTOGRÁFICA
 
 # =================================================================================================
+def _primes_below(limit):
+    sieve = bytearray([1]) * limit
+    sieve[:2] = b'\x00\x00'
+    for i in range(2, math.isqrt(limit - 1) + 1):
+        if sieve[i]:
+            sieve[i * i::i] = bytes(len(range(i * i, limit, i)))
+    return tuple(i for i, is_p in enumerate(sieve) if is_p)
+
 class CriptoMath:
     ALPHABET = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+    # Caracteres que los cifrados tratan como letras (char.upper() in ALPHABET): las 52
+    # letras ASCII más los casos Unicode cuya mayúscula cae dentro del alfabeto.
+    _LETTERS = string.ascii_letters + 'ıſﬅﬆ'
+    # A partir de este tamaño (en bits) egcd usa pasos de Lehmer
+    LEHMER_BITS = 2048
+    _SMALL_PRIMES = _primes_below(1000)
+    # Producto de los primos < 20000 (se calcula al generar el primer primo): un solo mcd
+    # descarta la mayoría de candidatos
+    _PRIMORIAL = None
+    # Tablas de traducción precalculadas para str.translate, por llave normalizada
+    _TABLE_CACHE = {}
+    # Tamaño (en caracteres) de los fragmentos que se procesan al cifrar archivos
+    CHUNK_SIZE = 1 << 20
+    # Por debajo de este tamaño el camino vectorizado no compensa su costo fijo
+    NUMPY_MIN_SIZE = 4096
+    # Tamaño de fragmento por defecto que parallel_cipher reparte entre procesos
+    PARALLEL_CHUNK_SIZE = 4 << 20
+    # Frecuencias relativas de A-Z (en %) para puntuar descifrados con χ²
+    LETTER_FREQUENCIES = {
+        'en': (8.167, 1.492, 2.782, 4.253, 12.702, 2.228, 2.015, 6.094, 6.966, 0.153, 0.772, 4.025, 2.406,
+               6.749, 7.507, 1.929, 0.095, 5.987, 6.327, 9.056, 2.758, 0.978, 2.360, 0.150, 1.974, 0.074),
+        'es': (12.53, 1.42, 4.68, 5.86, 13.68, 0.69, 1.01, 0.70, 6.25, 0.44, 0.02, 4.97, 3.15,
+               6.71, 8.68, 2.51, 0.88, 6.87, 7.98, 4.63, 3.93, 0.90, 0.01, 0.22, 0.90, 0.52),
+    }
+    # Letras iniciales en las que se buscan trigramas repetidos (examen de Kasiski)
+    KASISKI_LIMIT = 50000
+    # Peso de la evidencia de IC y Kasiski frente al χ² por letra al ordenar longitudes de llave
+    KEY_LENGTH_WEIGHT = 0.4
+    # Exponenciaciones RSA memoizadas como máximo por un procesador de lotes
+    BATCH_MEMO_LIMIT = 1 << 16
+    # Caracteres de cada candidata de fuerza bruta que se descifran como vista previa
+    BRUTE_FORCE_PREVIEW = 80
+    # Muestreo por rechazo de la llave OTP: byte -> letra (byte % 26) y bytes descartados
+    _OTP_BYTE_TABLE = bytes(65 + i % 26 for i in range(256))
+    _OTP_REJECTED = bytes(range(234, 256))
+    _NON_LETTER_BYTES = bytes(set(range(256)) - set(string.ascii_letters.encode('ascii')))
+    _LETTER_RUNS = re.compile(rb'[A-Za-z]+')
 
     @staticmethod
     def mcd(a, b):
@@ -16,10 +162,40 @@ class CriptoMath:
 
     @staticmethod
     def egcd(a, b):
-        if a == 0:
-            return (b, 0, 1)
-        g, y, x = CriptoMath.egcd(b % a, a)
-        return (g, x - (b // a) * y, y)
+        # Versión iterativa: mismos coeficientes que la recursiva, sin límite de recursión.
+        # Con operandos grandes y no negativos, los pasos de Lehmer sustituyen muchas
+        # divisiones largas por operaciones sobre los 62 bits más significativos.
+        _count('egcd')
+        r_prev, r = b, a
+        xa_prev, xa = 0, 1
+        xb_prev, xb = 1, 0
+        if a >= 0 and b >= 0:
+            while r.bit_length() > CriptoMath.LEHMER_BITS:
+                shift = max(r_prev, r).bit_length() - 62
+                x, y = r_prev >> shift, r >> shift
+                A, B, C, D = 1, 0, 0, 1
+                while y + C and y + D:
+                    q = (x + A) // (y + C)
+                    if q != (x + B) // (y + D):
+                        break
+                    A, C = C, A - q * C
+                    B, D = D, B - q * D
+                    x, y = y, x - q * y
+                if B == 0:
+                    q = r_prev // r
+                    r_prev, r = r, r_prev - q * r
+                    xa_prev, xa = xa, xa_prev - q * xa
+                    xb_prev, xb = xb, xb_prev - q * xb
+                else:
+                    r_prev, r = A * r_prev + B * r, C * r_prev + D * r
+                    xa_prev, xa = A * xa_prev + B * xa, C * xa_prev + D * xa
+                    xb_prev, xb = A * xb_prev + B * xb, C * xb_prev + D * xb
+        while r:
+            q = r_prev // r
+            r_prev, r = r, r_prev - q * r
+            xa_prev, xa = xa, xa_prev - q * xa
+            xb_prev, xb = xb, xb_prev - q * xb
+        return (r_prev, xa_prev, xb_prev)
 
     @staticmethod
     def modinv(a, m):
@@ -30,124 +206,1052 @@ class CriptoMath:
             raise ValueError(f"La inversa de {a} mod {m} no existe (MCD={g} ≠ 1).")
         return (x % m + m) % m
 
+    @staticmethod
+    def batch_modinv(values, m):
+        # Truco de Montgomery: una sola inversión y 3(n-1) multiplicaciones para n valores
+        if m <= 1:
+            raise ValueError("El módulo debe ser mayor que 1.")
+        values = [v % m for v in values]
+        if not values: return []
+        prefix, acc = [], 1
+        for v in values:
+            acc = acc * v % m
+            prefix.append(acc)
+        try:
+            inv = CriptoMath.modinv(acc, m)
+        except ValueError:
+            bad = next(v for v in values if CriptoMath.mcd(v, m) != 1)
+            raise ValueError(f"La inversa de {bad} mod {m} no existe (MCD={CriptoMath.mcd(bad, m)} ≠ 1).")
+        result = [0] * len(values)
+        for i in range(len(values) - 1, 0, -1):
+            result[i] = inv * prefix[i - 1] % m
+            inv = inv * values[i] % m
+        result[0] = inv
+        return result
+
     @staticmethod
     def power(base, exp, mod):
         return pow(base, exp, mod)
 
     @staticmethod
-    def is_prime(num):
+    def is_prime(num, rounds=40):
+        # Pre-criba con primos pequeños y Miller-Rabin: determinista para n < 2^64 y
+        # probabilístico (error <= 4^-rounds) para enteros mayores.
+        _count('primality_tests')
         if num < 2: return False
-        if num == 2 or num == 3: return True
-        if num % 2 == 0 or num % 3 == 0: return False
-        i = 5
-        while i * i <= num:
-            if num % i == 0 or num % (i + 2) == 0:
-                return False
-            i += 6
-        return True
-
-    @staticmethod
-    def caesar_cipher(text, b, decrypt=False):
-        op = -1 if decrypt else 1
-        effective_k = op * b
-        result = ''
-        steps = []
-        for char in text:
-            if char.upper() in CriptoMath.ALPHABET:
-                char_code = ord(char)
+        for p in CriptoMath._SMALL_PRIMES:
+            if num % p == 0:
+                return num == p
+        if num < CriptoMath._SMALL_PRIMES[-1] ** 2:
+            return True
+        if num < 1 << 64:
+            bases = CriptoMath._SMALL_PRIMES[:12]
+        else:
+            bases = [2] + [2 + secrets.randbelow(num - 3) for _ in range(rounds - 1)]
+        return all(CriptoMath._miller_rabin(num, a) for a in bases)
+
+    @staticmethod
+    def _miller_rabin(n, a):
+        d, s = n - 1, 0
+        while d % 2 == 0:
+            d //= 2; s += 1
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            return True
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                return True
+        return False
+
+    @staticmethod
+    def generate_prime(bits, rounds=None, progress=None):
+        # progress(0, 1) se llama por cada candidato que pasa la criba y progress(1, 1) al
+        # encontrar el primo: el número de intentos no se conoce de antemano
+        if bits < 2: raise ValueError("Un primo necesita al menos 2 bits.")
+        if rounds is None:
+            # Rondas para error < 2^-100 con candidatos aleatorios (FIPS 186-4, tabla C.2)
+            rounds = 4 if bits >= 1024 else 7 if bits >= 512 else 40
+        if CriptoMath._PRIMORIAL is None:
+            CriptoMath._PRIMORIAL = math.prod(_primes_below(20000))
+        while True:
+            # Los dos bits altos en 1 garantizan que p*q tenga exactamente 2*bits bits
+            candidate = secrets.randbits(bits) | (3 << (bits - 2)) | 1
+            if bits > 10 and math.gcd(candidate, CriptoMath._PRIMORIAL) != 1:
+                continue
+            if progress: progress(0, 1)
+            if CriptoMath.is_prime(candidate, rounds):
+                if progress: progress(1, 1)
+                return candidate
+
+    @staticmethod
+    def _rsa_check_exponent(e):
+        # Un e par nunca es coprimo con φ(N) = (p-1)(q-1), y e = 1 no cifra nada
+        if e <= 1 or e % 2 == 0:
+            raise ValueError(f"El exponente e={e} debe ser impar y mayor que 1.")
+
+    @staticmethod
+    def generate_rsa_keypair(bits=2048, e=65537, progress=None):
+        if bits < 16: raise ValueError("El tamaño de la clave debe ser de al menos 16 bits.")
+        CriptoMath._rsa_check_exponent(e)
+        # El progreso avanza a la mitad con p y al final con q
+        p_progress = (lambda done, total: progress(done, 2)) if progress else None
+        q_progress = (lambda done, total: progress(1 + done, 2)) if progress else None
+        while True:
+            p = CriptoMath.generate_prime(bits // 2, progress=p_progress)
+            q = CriptoMath.generate_prime(bits - bits // 2, progress=q_progress)
+            if p != q and math.gcd(e, (p - 1) * (q - 1)) == 1:
+                return RSAPrivateKey(p, q, e)
+
+    @staticmethod
+    def _caesar_table(b, decrypt=False, as_bytes=False):
+        # El desplazamiento solo importa módulo 26: se normaliza para acotar la caché
+        key = ('caesar', b % 26, decrypt)
+        table = CriptoMath._TABLE_CACHE.get(key)
+        if table is None:
+            effective_k = -b if decrypt else b
+            mapping = {}
+            for char in CriptoMath._LETTERS:
                 base = 65 if char.isupper() else 97
-                P = char_code - base
-                C = (P + effective_k) % 26
-                new_char = chr(base + C)
-                result += new_char
-                steps.append((f"'{char}' (P={P})", f"({P} {'-' if decrypt else '+'} {b}) mod 26", f"'{new_char}' (C={C})"))
-            else:
-                result += char
-                steps.append((f"'{char}'", 'No es una letra', f"'{char}'"))
+                mapping[ord(char)] = chr(base + (ord(char) - base + effective_k) % 26)
+            table = CriptoMath._TABLE_CACHE[key] = mapping
+        return CriptoMath._byte_table(key, table) if as_bytes else table
+
+    @staticmethod
+    def _affine_table(a, b, decrypt=False, as_bytes=False):
+        key = ('affine', a % 26, b % 26, decrypt)
+        table = CriptoMath._TABLE_CACHE.get(key)
+        if table is None:
+            # Con a no coprimo con 26 varias letras comparten imagen y el cifrado no se puede deshacer
+            g = math.gcd(a, 26)
+            if g != 1:
+                raise ValueError(f"a={a} no es coprimo con 26 (MCD={g}): el cifrado afín no sería reversible.")
+            if decrypt:
+                a_inv = CriptoMath.modinv(a, 26)
+            mapping = {}
+            for char in CriptoMath._LETTERS:
+                X = CriptoMath.ALPHABET.find(char.upper())
+                Y = (a_inv * (X - b)) % 26 if decrypt else (a * X + b) % 26
+                new_char = CriptoMath.ALPHABET[Y]
+                mapping[ord(char)] = new_char.lower() if char.islower() else new_char
+            table = CriptoMath._TABLE_CACHE[key] = mapping
+        return CriptoMath._byte_table(key, table) if as_bytes else table
+
+    @staticmethod
+    def _byte_table(key, table):
+        # Tabla de 256 bytes para bytes.translate: solo cambian las letras ASCII, el resto de
+        # bytes (incluidos los de secuencias UTF-8) se copia tal cual.
+        key = key + ('bytes',)
+        byte_table = CriptoMath._TABLE_CACHE.get(key)
+        if byte_table is None:
+            byte_table = CriptoMath._TABLE_CACHE[key] = bytes(ord(table.get(i, chr(i))) if i < 128 else i for i in range(256))
+        return byte_table
+
+    @staticmethod
+    def _byte_chunks(data, chunk_size=None):
+        # Copias de a lo sumo chunk_size bytes de un búfer (bytes, bytearray, memoryview, mmap)
+        chunk_size = chunk_size or CriptoMath.CHUNK_SIZE
+        with memoryview(data) as view, view.cast('B') as flat:
+            for i in range(0, len(flat), chunk_size):
+                yield flat[i:i + chunk_size].tobytes()
+
+    @staticmethod
+    def _ascii_text(data):
+        # Texto equivalente a un búfer para construir los pasos: cada byte no ASCII pasa a
+        # ser un carácter U+FFFD, que no es letra, igual que el byte en el cifrado.
+        return bytes(data).decode('ascii', 'replace')
+
+    @staticmethod
+    def _check_buffer(data):
+        if isinstance(data, str):
+            raise ValueError("out solo admite entradas de bytes (bytes, bytearray, memoryview o mmap).")
+
+    @staticmethod
+    def _cipher_buffer(data, cipher, key, decrypt=False, out=None, progress=None, chunk_size=None):
+        # Cifra un búfer por fragmentos con cipher_stream. Sin out devuelve bytes nuevos; con out
+        # escribe el resultado en ese búfer, que puede ser el propio data (cifrado en el sitio).
+        CriptoMath._check_buffer(data)
+        with memoryview(data) as view:
+            total = view.nbytes
+        results = CriptoMath.cipher_stream(CriptoMath._byte_chunks(data, chunk_size), cipher, key, decrypt, progress, total)
+        if out is None:
+            return b''.join(results)
+        with memoryview(out) as view, view.cast('B') as target:
+            if target.readonly: raise ValueError("El búfer de salida no admite escritura.")
+            if len(target) != total:
+                raise ValueError(f"El búfer de salida ({len(target)} bytes) debe medir lo mismo que la entrada ({total} bytes).")
+            done = 0
+            for part in results:
+                target[done:done + len(part)] = part; done += len(part)
+        return out
+
+    @staticmethod
+    def _bytes_cipher(data, cipher, key, decrypt, trace, out=None, progress=None, chunk_size=None):
+        # Los pasos se toman del texto antes de cifrar: con out=data el búfer se sobrescribe
+        CriptoMath._check_buffer(data)
+        source = CriptoMath._ascii_text(data) if trace else None
+        result = CriptoMath._cipher_buffer(data, cipher, key, decrypt, out, progress, chunk_size)
+        if not trace:
+            return {'result': result, 'steps': []}
+        steps = CriptoMath._cipher_steps(source, CriptoMath._ascii_text(result), cipher, key, decrypt)
+        return {'result': result, 'steps': CriptoMath._trace(steps, trace)}
+
+    @staticmethod
+    def _trace(steps, trace):
+        # trace=True: lista completa (comportamiento clásico); 'lazy': iterable que formatea
+        # cada fila solo al consumirse; False: no se construye ningún paso. Los StepRecords ya
+        # formatean bajo demanda y se devuelven tal cual en ambos modos.
+        if not trace:
+            return []
+        if trace == 'lazy' or isinstance(steps, StepRecords):
+            return steps
+        return list(steps)
+
+    @staticmethod
+    def _caesar_step(char, new_char, b, decrypt):
+        if char.upper() in CriptoMath.ALPHABET:
+            base = 65 if char.isupper() else 97
+            P = ord(char) - base
+            C = ord(new_char) - (65 if new_char.isupper() else 97)
+            return (f"'{char}' (P={P})", f"({P} {'-' if decrypt else '+'} {b}) mod 26", f"'{new_char}' (C={C})")
+        return (f"'{char}'", 'No es una letra', f"'{char}'")
+
+    @staticmethod
+    def _caesar_steps(text, result, b, decrypt):
+        return StepRecords(text, result, lambda char, new_char, _: CriptoMath._caesar_step(char, new_char, b, decrypt))
+
+    @staticmethod
+    def caesar_cipher(text, b, decrypt=False, trace=True, out=None):
+        # text puede ser str o un búfer de bytes; out: búfer escribible donde dejar el resultado
+        if out is not None or not isinstance(text, str):
+            return CriptoMath._bytes_cipher(text, 'caesar', b, decrypt, trace, out)
+        _count('chars', len(text))
+        result = text.translate(CriptoMath._caesar_table(b, decrypt))
+        steps = CriptoMath._trace(CriptoMath._caesar_steps(text, result, b, decrypt), trace)
         return {'result': result, 'steps': steps}
 
     @staticmethod
-    def affine_cipher(text, a, b, decrypt=False):
-        result, steps = '', []
+    def _affine_step(char, new_char, a, b, a_inv):
+        # a_inv es None al cifrar
+        if char.upper() in CriptoMath.ALPHABET:
+            X = CriptoMath.ALPHABET.find(char.upper())
+            new_char = new_char.upper()
+            Y = CriptoMath.ALPHABET.find(new_char)
+            if a_inv is not None:
+                return (f"'{char}' (C={X})", f"{a_inv}*({X}-{b}) mod 26", f"'{new_char}' (P={Y})")
+            return (f"'{char}' (P={X})", f"({a}*{X}+{b}) mod 26", f"'{new_char}' (C={Y})")
+        return (f"'{char}'", 'No es una letra', f"'{char}'")
+
+    @staticmethod
+    def _affine_steps(text, result, a, b, decrypt):
+        a_inv, header = None, ()
         if decrypt:
             a_inv = CriptoMath.modinv(a, 26)
-            steps.append(("Paso 1: Inversa", f"Inversa de a={a} mod 26", f"a⁻¹ = {a_inv}"))
-            for char in text:
-                if char.upper() in CriptoMath.ALPHABET:
-                    C = CriptoMath.ALPHABET.find(char.upper())
-                    P = (a_inv * (C - b)) % 26
-                    new_char = CriptoMath.ALPHABET[P]
-                    result += new_char.lower() if char.islower() else new_char
-                    steps.append((f"'{char}' (C={C})", f"{a_inv}*({C}-{b}) mod 26", f"'{new_char}' (P={P})"))
-                else:
-                    result += char
-                    steps.append((f"'{char}'", 'No es una letra', f"'{char}'"))
-        else:
-            for char in text:
-                if char.upper() in CriptoMath.ALPHABET:
-                    P = CriptoMath.ALPHABET.find(char.upper())
-                    C = (a * P + b) % 26
-                    new_char = CriptoMath.ALPHABET[C]
-                    result += new_char.lower() if char.islower() else new_char
-                    steps.append((f"'{char}' (P={P})", f"({a}*{P}+{b}) mod 26", f"'{new_char}' (C={C})"))
-                else:
-                    result += char
-                    steps.append((f"'{char}'", 'No es una letra', f"'{char}'"))
+            header = (("Paso 1: Inversa", f"Inversa de a={a} mod 26", f"a⁻¹ = {a_inv}"),)
+        return StepRecords(text, result, lambda char, new_char, _: CriptoMath._affine_step(char, new_char, a, b, a_inv), header)
+
+    @staticmethod
+    def affine_cipher(text, a, b, decrypt=False, trace=True, out=None):
+        if out is not None or not isinstance(text, str):
+            return CriptoMath._bytes_cipher(text, 'affine', (a, b), decrypt, trace, out)
+        _count('chars', len(text))
+        result = text.translate(CriptoMath._affine_table(a, b, decrypt))
+        steps = CriptoMath._trace(CriptoMath._affine_steps(text, result, a, b, decrypt), trace)
         return {'result': result, 'steps': steps}
 
     @staticmethod
-    def vigenere_cipher(text, key, decrypt=False):
-        clean_key = ''.join(filter(str.isalpha, key)).upper()
+    def _vigenere_key(key):
+        # Las llaves OTP ya suelen ser solo letras: se evita filtrarlas carácter a carácter
+        clean_key = (key if key.isalpha() else ''.join(filter(str.isalpha, key))).upper()
         if not clean_key: raise ValueError("La llave debe contener al menos una letra.")
-        result, steps, key_index = '', [], 0
+        return clean_key
+
+    @staticmethod
+    def _vigenere_step(char, new_char, letters, clean_key, decrypt):
+        # letters: letras hasta esta fila inclusive; la llave usada es la posición letters - 1
+        if char.isalpha():
+            k_char = clean_key[(letters - 1) % len(clean_key)]
+            k_shift = CriptoMath.ALPHABET.find(k_char)
+            _, calc, out = CriptoMath._caesar_step(char, new_char, k_shift, decrypt)
+            return (f"'{char}'", f"'{k_char}'", k_shift, calc, out)
+        return (f"'{char}'", 'N/A', 'N/A', 'No es una letra', f"'{char}'")
+
+    @staticmethod
+    def _vigenere_steps(text, result, clean_key, decrypt):
+        # Las letras acumuladas por fila ubican la letra de la llave; StepRecords las cuenta al leer
+        return StepRecords(text, result, lambda char, new_char, n: CriptoMath._vigenere_step(char, new_char, n, clean_key, decrypt), count_letters=True)
+
+    @staticmethod
+    def _vigenere_prepare(clean_key, decrypt):
+        # Material de llave reutilizable entre fragmentos. Las tablas (camino puro) y el
+        # arreglo de desplazamientos (camino NumPy) se construyen solo cuando se necesitan.
+        return {'key': clean_key, 'decrypt': decrypt, 'tables': None, 'byte_tables': None, 'shifts': None}
+
+    @staticmethod
+    def _vigenere_chunk(text, prepared, key_index=0):
+        # Cifra un fragmento empezando en la posición key_index de la llave y devuelve
+        # también la posición siguiente, para poder continuar en el fragmento posterior.
+        if not isinstance(text, str):
+            return CriptoMath._vigenere_bytes(text, prepared, key_index)
+        if len(text) >= CriptoMath.NUMPY_MIN_SIZE and text.isascii() and _numpy() is not None:
+            return CriptoMath._vigenere_chunk_np(text, prepared, key_index)
+        tables = prepared['tables']
+        if tables is None:
+            tables = prepared['tables'] = [CriptoMath._caesar_table(CriptoMath.ALPHABET.find(k), prepared['decrypt']) for k in prepared['key']]
+        result, key_len = [], len(tables)
         for char in text:
             if char.isalpha():
-                k_char = clean_key[key_index % len(clean_key)]
-                k_shift = CriptoMath.ALPHABET.find(k_char)
-                sub_res = CriptoMath.caesar_cipher(char, k_shift, decrypt)
-                result += sub_res['result']
-                steps.append((f"'{char}'", f"'{k_char}'", k_shift, sub_res['steps'][0][1], sub_res['steps'][0][2]))
+                result.append(tables[key_index % key_len].get(ord(char), char))
                 key_index += 1
             else:
-                result += char
-                steps.append((f"'{char}'", 'N/A', 'N/A', 'No es una letra', f"'{char}'"))
+                result.append(char)
+        return ''.join(result), key_index
+
+    @staticmethod
+    def _vigenere_bytes(data, prepared, key_index):
+        # En bytes solo avanzan la llave las letras ASCII
+        np = _numpy() if len(data) >= CriptoMath.NUMPY_MIN_SIZE else None
+        if np is not None:
+            out, key_index = CriptoMath._vigenere_codes_np(np.frombuffer(data, dtype=np.uint8), prepared, key_index)
+            return out.tobytes(), key_index
+        tables = prepared['byte_tables']
+        if tables is None:
+            tables = prepared['byte_tables'] = [CriptoMath._caesar_table(CriptoMath.ALPHABET.find(k), prepared['decrypt'], True) for k in prepared['key']]
+        # Las letras se extraen juntas, cada columna de la llave se traduce de una vez y
+        # luego se devuelven a su sitio tramo a tramo
+        letters = data.translate(None, CriptoMath._NON_LETTER_BYTES)
+        key_len, shifted = len(tables), bytearray(letters)
+        for j in range(min(key_len, len(letters))):
+            shifted[j::key_len] = letters[j::key_len].translate(tables[(key_index + j) % key_len])
+        out, pos = bytearray(data), 0
+        for match in CriptoMath._LETTER_RUNS.finditer(data):
+            start, end = match.span()
+            out[start:end] = shifted[pos:pos + end - start]
+            pos += end - start
+        return bytes(out), key_index + len(letters)
+
+    @staticmethod
+    def _vigenere_chunk_np(text, prepared, key_index):
+        # En texto ASCII, isalpha() coincide con las 52 letras: se desplazan todas a la vez
+        np = _numpy()
+        out, key_index = CriptoMath._vigenere_codes_np(np.frombuffer(text.encode('ascii'), dtype=np.uint8), prepared, key_index)
+        return out.tobytes().decode('ascii'), key_index
+
+    @staticmethod
+    def _vigenere_codes_np(data, prepared, key_index):
+        np = _numpy()
+        shifts = prepared['shifts']
+        if shifts is None:
+            clean_key = prepared['key']
+            if clean_key.isascii():
+                shifts = np.frombuffer(clean_key.encode('ascii'), dtype=np.uint8).astype(np.int16) - 65
+            else:
+                shifts = np.array([CriptoMath.ALPHABET.find(k) for k in clean_key], dtype=np.int16)
+            if prepared['decrypt']:
+                shifts = -shifts
+            shifts = prepared['shifts'] = shifts % 26
+        upper = (data >= 65) & (data <= 90)
+        letters = np.flatnonzero(upper | ((data >= 97) & (data <= 122)))
+        key_len = len(shifts)
+        k = shifts[(np.arange(key_index, key_index + len(letters)) % key_len)]
+        base = np.where(upper[letters], 65, 97).astype(np.int16)
+        out = data.copy()
+        out[letters] = (data[letters] - base + k) % 26 + base
+        return out, key_index + len(letters)
+
+    @staticmethod
+    def vigenere_cipher(text, key, decrypt=False, trace=True, out=None):
+        if out is not None or not isinstance(text, str):
+            return CriptoMath._bytes_cipher(text, 'vigenere', key, decrypt, trace, out)
+        _count('chars', len(text))
+        clean_key = CriptoMath._vigenere_key(key)
+        result, _ = CriptoMath._vigenere_chunk(text, CriptoMath._vigenere_prepare(clean_key, decrypt))
+        steps = CriptoMath._trace(CriptoMath._vigenere_steps(text, result, clean_key, decrypt), trace)
         return {'result': result, 'steps': steps}
         
     @staticmethod
-    def one_time_pad_cipher(text, key, decrypt=False):
-        clean_key = ''.join(filter(str.isalpha, key)).upper()
-        clean_text = ''.join(filter(str.isalpha, text))
-        if len(clean_key) != len(clean_text):
-            raise ValueError(f"La longitud del mensaje ({len(clean_text)}) y la llave ({len(clean_key)}) deben ser iguales.")
+    def _count_letters(text):
+        # Número de caracteres con isalpha(), sin construir la cadena filtrada. En un búfer de
+        # bytes, número de letras ASCII.
+        if not isinstance(text, str):
+            return sum(len(chunk.translate(None, CriptoMath._NON_LETTER_BYTES)) for chunk in CriptoMath._byte_chunks(text))
+        if len(text) >= CriptoMath.NUMPY_MIN_SIZE and text.isascii() and _numpy() is not None:
+            np = _numpy()
+            data = np.frombuffer(text.encode('ascii'), dtype=np.uint8) | 0x20
+            return int(np.count_nonzero((data >= 97) & (data <= 122)))
+        return sum(map(str.isalpha, text))
+
+    @staticmethod
+    def _otp_check(text, key):
+        key_len = len((key if key.isalpha() else ''.join(filter(str.isalpha, key))).upper())
+        text_len = CriptoMath._count_letters(text)
+        if key_len != text_len:
+            raise ValueError(f"La longitud del mensaje ({text_len}) y la llave ({key_len}) deben ser iguales.")
+
+    @staticmethod
+    def one_time_pad_cipher(text, key, decrypt=False, trace=True, key_file=None, out=None):
+        # Con key_file la llave se lee del archivo por fragmentos en lugar de recibirla como cadena
+        if key_file is not None:
+            if trace:
+                with open(key_file, encoding='ascii') as pad:
+                    key = ''.join(filter(str.isalpha, pad.read()))
+            elif out is not None or not isinstance(text, str):
+                with open(key_file, encoding='ascii') as pad:
+                    return {'result': CriptoMath._cipher_buffer(text, 'otp', pad, decrypt, out), 'steps': []}
+            else:
+                chunk_size = CriptoMath.CHUNK_SIZE
+                with open(key_file, encoding='ascii') as pad:
+                    chunks = (text[i:i + chunk_size] for i in range(0, len(text), chunk_size))
+                    return {'result': ''.join(CriptoMath._otp_stream(chunks, pad, decrypt)), 'steps': []}
+        CriptoMath._otp_check(text, key)
         # OTP es un caso especial de Vigenère
-        return CriptoMath.vigenere_cipher(text, key, decrypt)
+        return CriptoMath.vigenere_cipher(text, key, decrypt, trace, out)
 
     @staticmethod
-    def rsa_cipher(text, N, key, mode):
-        steps = []
+    def _pad_reader(pad):
+        # Devuelve take(n): las siguientes n letras de la llave, leyendo el archivo por bloques
+        state = {'buffer': ''}
+        def take(n):
+            buffer = state['buffer']
+            while len(buffer) < n:
+                block = pad.read(max(CriptoMath.CHUNK_SIZE, n - len(buffer)))
+                if not block: break
+                buffer += ''.join(filter(str.isalpha, block)) if not block.isalpha() else block
+            state['buffer'] = buffer[n:]
+            return buffer[:n].upper()
+        return take
+
+    @staticmethod
+    def _otp_stream(chunks, pad, decrypt=False):
+        # Cada fragmento consume tantas letras de la llave como letras contiene
+        take = CriptoMath._pad_reader(pad)
+        done = 0
+        for chunk in chunks:
+            _count('chars', len(chunk))
+            needed = CriptoMath._count_letters(chunk)
+            piece = take(needed)
+            done += len(piece)
+            if len(piece) < needed:
+                raise ValueError(f"La llave ({done} letras) es más corta que el mensaje.")
+            yield CriptoMath._vigenere_chunk(chunk, CriptoMath._vigenere_prepare(piece, decrypt))[0] if needed else chunk
+        if take(1):
+            raise ValueError(f"La llave es más larga que el mensaje ({done} letras); deben tener la misma longitud.")
+
+    @staticmethod
+    def _otp_key_chunks(length, chunk_size=None):
+        # Bytes de secrets (os.urandom) por bloques; se descartan los >= 234 = 9·26 para que
+        # byte % 26 sea uniforme. translate hace el muestreo por rechazo en una sola pasada.
+        chunk_size = chunk_size or CriptoMath.CHUNK_SIZE
+        while length > 0:
+            n, parts = min(length, chunk_size), []
+            missing = n
+            while missing:
+                piece = secrets.token_bytes(missing + missing // 8 + 16).translate(CriptoMath._OTP_BYTE_TABLE, CriptoMath._OTP_REJECTED)
+                parts.append(piece[:missing])
+                missing -= len(parts[-1])
+            length -= n
+            yield b''.join(parts).decode('ascii')
+
+    @staticmethod
+    def generate_otp_key(length):
+        if length < 0: raise ValueError("La longitud de la llave no puede ser negativa.")
+        return ''.join(CriptoMath._otp_key_chunks(length))
+
+    @staticmethod
+    def generate_otp_key_file(path, length, chunk_size=None, progress=None):
+        if length < 0: raise ValueError("La longitud de la llave no puede ser negativa.")
+        done = 0
+        with open(path, 'w', encoding='ascii', newline='') as dst:
+            for chunk in CriptoMath._otp_key_chunks(length, chunk_size):
+                dst.write(chunk)
+                done += len(chunk)
+                if progress: progress(done, length)
+        return length
+
+    @staticmethod
+    def count_file_letters(path, chunk_size=None, progress=None):
+        # Letras (isalpha) de un archivo de texto, para dimensionar su llave de un solo uso
+        chunk_size = chunk_size or CriptoMath.CHUNK_SIZE
+        total = 0
+        with open(path, encoding='utf-8', errors='surrogateescape', newline='') as src:
+            on_chunk = CriptoMath._file_progress(src, progress)
+            for chunk in iter(lambda: src.read(chunk_size), ''):
+                total += CriptoMath._count_letters(chunk)
+                if on_chunk: on_chunk(None, None)
+        return total
+
+    # --- Criptoanálisis de Vigenère ---
+
+    @staticmethod
+    def _letter_codes(text):
+        # Una posición por cada carácter con isalpha() (las que avanzan la llave de Vigenère):
+        # la letra A-Z en mayúscula, o 0 si el cifrado no la desplaza.
+        if text.isascii():
+            return text.encode('ascii').upper().translate(None, CriptoMath._NON_LETTER_BYTES)
+        return bytes(65 + CriptoMath.ALPHABET.index(c.upper()) if c in CriptoMath._LETTERS else 0
+                     for c in text if c.isalpha())
+
+    @staticmethod
+    def _column_counts(codes, length):
+        # Histograma de letras de cada columna (posiciones con el mismo índice de llave)
+        np = _numpy() if len(codes) >= CriptoMath.NUMPY_MIN_SIZE else None
+        if np is None:
+            return [[col.count(c) for c in range(65, 91)] for col in (codes[k::length] for k in range(length))]
+        idx = np.frombuffer(codes, dtype=np.uint8).astype(np.intp) - 65
+        idx[idx < 0] = 26
+        return [np.bincount(idx[k::length], minlength=27)[:26].tolist() for k in range(length)]
+
+    @staticmethod
+    def index_of_coincidence(counts):
+        n = sum(counts)
+        return sum(c * (c - 1) for c in counts) / (n * (n - 1)) if n > 1 else 0.0
+
+    @staticmethod
+    def kasiski_distances(codes, limit=None):
+        # Distancias entre apariciones consecutivas de cada trigrama repetido
+        codes = codes[:limit or CriptoMath.KASISKI_LIMIT]
+        last, distances = {}, []
+        for i in range(len(codes) - 2):
+            tri = codes[i:i + 3]
+            if 0 in tri: continue
+            if tri in last:
+                distances.append(i - last[tri])
+            last[tri] = i
+        return distances
+
+    @staticmethod
+    def _chi_squared_shift(counts, expected):
+        # Desplazamiento (letra de la llave) cuyo descifrado mejor se ajusta a las frecuencias
+        n = sum(counts)
+        if n == 0: return 0, 0.0
+        best = None
+        for shift in range(26):
+            chi = sum((counts[(i + shift) % 26] - n * f) ** 2 / (n * f) for i, f in enumerate(expected))
+            if best is None or chi < best[1]:
+                best = (shift, chi)
+        return best
+
+    @staticmethod
+    def _primitive_key(key):
+        # 'LEMONLEMON' -> 'LEMON': las longitudes múltiplo de la real recuperan la llave repetida
+        for size in range(1, len(key)):
+            if len(key) % size == 0 and key[:size] * (len(key) // size) == key:
+                return key[:size]
+        return key
+
+    @staticmethod
+    def break_vigenere(text, max_length=20, language='en', candidates=5, progress=None):
+        # progress(longitudes probadas, max_length) tras analizar cada longitud de llave
+        if language not in CriptoMath.LETTER_FREQUENCIES:
+            raise ValueError(f"Idioma no soportado: '{language}'. Opciones: {', '.join(CriptoMath.LETTER_FREQUENCIES)}.")
+        codes = CriptoMath._letter_codes(text)
+        letters = len(codes) - codes.count(0)
+        if letters < 2:
+            raise ValueError("El texto cifrado no contiene suficientes letras para el análisis.")
+        freq = CriptoMath.LETTER_FREQUENCIES[language]
+        total = sum(freq)
+        expected = [f / total for f in freq]
+        max_length = max(1, min(max_length, len(codes) // 2))
+        distances = CriptoMath.kasiski_distances(codes)
+        # IC esperado del idioma y de un texto aleatorio: el IC medio de las columnas se acerca
+        # al del idioma con la longitud real y con sus múltiplos
+        ic_language, ic_random = sum(f * f for f in expected), 1 / 26
+
+        _count('key_lengths', max_length)
+        rows = []
+        for length in range(1, max_length + 1):
+            counts = CriptoMath._column_counts(codes, length)
+            ic = sum(map(CriptoMath.index_of_coincidence, counts)) / length
+            votes = sum(1 for d in distances if d % length == 0)
+            # Evidencia de la longitud (log, mayor es mejor): cercanía del IC al del idioma y
+            # fracción de distancias de Kasiski que divide (suavizada para textos sin
+            # repeticiones). Kasiski favorece a los divisores de la longitud real y el IC a
+            # sus múltiplos, así que la suma de ambos se maximiza en la longitud real.
+            ic_score = min(max((ic - ic_random) / (ic_language - ic_random), 1e-3), 1.5)
+            length_score = math.log(ic_score) + math.log((1 + votes) / (1 + len(distances)))
+            fits = [CriptoMath._chi_squared_shift(c, expected) for c in counts]
+            key = ''.join(CriptoMath.ALPHABET[shift] for shift, _ in fits)
+            rows.append((length, ic, votes, length_score, key, sum(chi for _, chi in fits) / letters))
+            if progress: progress(length, max_length)
+
+        # χ² recupera las letras de cada longitud; el orden combina su ajuste con la evidencia
+        # de IC y Kasiski. Las repeticiones de una misma llave se agrupan: ocupan el puesto de
+        # la mejor, pero se informan con la fila más corta que la produce.
+        shortest = {}
+        for row in rows:
+            shortest.setdefault(CriptoMath._primitive_key(row[4]), row)
+        weight = CriptoMath.KEY_LENGTH_WEIGHT
+        ranked, seen = [], set()
+        for row in sorted(rows, key=lambda r: (r[5] - weight * r[3], r[0])):
+            key = CriptoMath._primitive_key(row[4])
+            if key in seen: continue
+            seen.add(key)
+            length, ic, votes, length_score, _, score = shortest[key]
+            ranked.append({'key': key, 'length': length, 'score': score, 'ic': ic, 'kasiski': votes, 'length_score': length_score})
+            if len(ranked) == candidates: break
+
+        best = ranked[0]['key']
+        steps = [(length, f"{ic:.4f}", votes, f"{length_score:.3f}", key, f"{score:.4f}") for length, ic, votes, length_score, key, score in rows]
+        return {'result': CriptoMath.vigenere_cipher(text, best, decrypt=True, trace=False)['result'],
+                'key': best, 'candidates': ranked, 'steps': steps}
+
+    # --- Fuerza bruta sobre César y Afín ---
+
+    @staticmethod
+    def _letter_histogram(text):
+        # En UTF-8 los bytes ASCII solo aparecen como caracteres ASCII, así que basta contar
+        # las letras A-Z sobre los bytes en mayúscula (una sola pasada en C por letra)
+        data = text.encode('utf-8', 'surrogatepass').upper()
+        np = _numpy() if len(data) >= CriptoMath.NUMPY_MIN_SIZE else None
+        if np is None:
+            return [data.count(c) for c in range(65, 91)]
+        return np.bincount(np.frombuffer(data, dtype=np.uint8), minlength=256)[65:91].tolist()
+
+    @staticmethod
+    def brute_force(text, cipher='caesar', top=5, language='en', progress=None):
+        # Descifrar con (a, b) solo permuta el histograma del texto cifrado: cada llave se
+        # puntúa con χ² sobre esa permutación y únicamente las ganadoras se descifran.
+        if cipher not in ('caesar', 'affine'):
+            raise ValueError(f"Cifrado no soportado para fuerza bruta: '{cipher}'.")
+        if language not in CriptoMath.LETTER_FREQUENCIES:
+            raise ValueError(f"Idioma no soportado: '{language}'. Opciones: {', '.join(CriptoMath.LETTER_FREQUENCIES)}.")
+        if top < 1:
+            raise ValueError(f"top={top} debe ser al menos 1.")
+        counts = CriptoMath._letter_histogram(text)
+        n = sum(counts)
+        if n == 0:
+            raise ValueError("El texto cifrado no contiene letras.")
+        freq = CriptoMath.LETTER_FREQUENCIES[language]
+        expected = [n * f / sum(freq) for f in freq]
+
+        a_values = [1] if cipher == 'caesar' else [a for a in range(1, 26) if math.gcd(a, 26) == 1]
+        scored = []
+        for i, a in enumerate(a_values, 1):
+            a_inv = CriptoMath.modinv(a, 26)
+            for b in range(26):
+                # La letra cifrada Y proviene de X = a⁻¹(Y - b)
+                chi = sum((counts[y] - expected[(a_inv * (y - b)) % 26]) ** 2 / expected[(a_inv * (y - b)) % 26] for y in range(26))
+                scored.append((chi / n, b if cipher == 'caesar' else (a, b)))
+            if progress: progress(i, len(a_values))
+        scored.sort(key=lambda item: item[0])
+        _count('keys_scored', len(scored))
+
+        decrypt = CriptoMath.caesar_cipher if cipher == 'caesar' else lambda t, k, d, trace: CriptoMath.affine_cipher(t, *k, d, trace)
+        head = text[:CriptoMath.BRUTE_FORCE_PREVIEW]
+        candidates = [{'key': key, 'score': score, 'preview': decrypt(head, key, True, False)['result']}
+                      for score, key in scored[:top]]
+        best = candidates[0]['key']
+        steps = [(rank, c['key'], f"{c['score']:.4f}", c['preview']) for rank, c in enumerate(candidates, 1)]
+        return {'result': decrypt(text, best, True, False)['result'], 'key': best, 'candidates': candidates, 'steps': steps}
+
+    @staticmethod
+    def _chunk_cipher(cipher, key, decrypt=False, key_index=0):
+        # Devuelve una función que cifra fragmentos consecutivos de un mismo texto,
+        # conservando entre llamadas el estado necesario (key_index en Vigenère).
+        # Los fragmentos pueden ser str o bytes; cada tipo usa su propia tabla.
+        if cipher == 'caesar':
+            table, byte_table = CriptoMath._caesar_table(key, decrypt), CriptoMath._caesar_table(key, decrypt, True)
+            return lambda chunk: chunk.translate(table if isinstance(chunk, str) else byte_table)
+        if cipher == 'affine':
+            table, byte_table = CriptoMath._affine_table(*key, decrypt), CriptoMath._affine_table(*key, decrypt, True)
+            return lambda chunk: chunk.translate(table if isinstance(chunk, str) else byte_table)
+        if cipher == 'vigenere':
+            prepared = CriptoMath._vigenere_prepare(CriptoMath._vigenere_key(key), decrypt)
+            state = {'key_index': key_index}
+            def process(chunk):
+                result, state['key_index'] = CriptoMath._vigenere_chunk(chunk, prepared, state['key_index'])
+                return result
+            return process
+        raise ValueError(f"Cifrado desconocido: '{cipher}'. Use 'caesar', 'affine' o 'vigenere'.")
+
+    @staticmethod
+    def cipher_stream(chunks, cipher, key, decrypt=False, progress=None, total=None):
+        # key: b (César), (a, b) (Afín), la llave de texto (Vigenère) o el archivo de llave
+        # ya abierto (OTP). progress(hechos, total) se llama tras cada fragmento, con hechos
+        # en caracteres (o bytes si los fragmentos son bytes).
+        if cipher == 'otp':
+            results = CriptoMath._otp_stream(chunks, key, decrypt)
+        else:
+            results = map(CriptoMath._chunk_cipher(cipher, key, decrypt), chunks)
+        done = 0
+        for part in results:
+            # _otp_stream cuenta sus propios caracteres
+            if cipher != 'otp': _count('chars', len(part))
+            done += len(part)
+            if progress: progress(done, total)
+            yield part
+
+    @staticmethod
+    def encrypt_file(in_path, out_path, cipher, key, decrypt=False, chunk_size=None, progress=None):
+        # progress(bytes leídos, tamaño del archivo) tras cada fragmento
+        chunk_size = chunk_size or CriptoMath.CHUNK_SIZE
+        # newline='' y surrogateescape: la salida conserva los bytes que no se cifran
+        total = 0
+        with open(in_path, encoding='utf-8', errors='surrogateescape', newline='') as src, \
+             open(out_path, 'w', encoding='utf-8', errors='surrogateescape', newline='') as dst, \
+             (open(key, encoding='ascii') if cipher == 'otp' else nullcontext(key)) as key:
+            chunks = iter(lambda: src.read(chunk_size), '')
+            on_chunk = CriptoMath._file_progress(src, progress)
+            for chunk in CriptoMath.cipher_stream(chunks, cipher, key, decrypt, on_chunk):
+                dst.write(chunk)
+                total += len(chunk)
+        return total
+
+    @staticmethod
+    def _file_progress(src, progress):
+        # Adapta progress al avance en bytes de un archivo de texto abierto: los caracteres
+        # procesados no se corresponden con el tamaño cuando hay UTF-8 multibyte
+        if progress is None:
+            return None
+        size = os.fstat(src.fileno()).st_size
+        return lambda done, total: progress(src.buffer.tell(), size)
+
+    @staticmethod
+    def cipher_file_inplace(path, cipher, key, decrypt=False, progress=None, chunk_size=None):
+        # Cifra el archivo sobre sí mismo a través de un mmap, sin decodificarlo ni copiarlo
+        # entero. Cambian solo las letras ASCII; con 'otp', key es la ruta del archivo de llave.
+        with open(path, 'r+b') as f, \
+             (open(key, encoding='ascii') if cipher == 'otp' else nullcontext(key)) as key:
+            size = f.seek(0, 2)
+            if size == 0:
+                # mmap no admite archivos vacíos; igual se valida la llave
+                CriptoMath._cipher_buffer(b'', cipher, key, decrypt)
+                return 0
+            with mmap.mmap(f.fileno(), 0) as mm:
+                CriptoMath._cipher_buffer(mm, cipher, key, decrypt, mm, progress, chunk_size)
+                mm.flush()
+        return size
+
+    @staticmethod
+    def _parallel_worker(chunk, cipher, key, decrypt, key_index):
+        return CriptoMath._chunk_cipher(cipher, key, decrypt, key_index)(chunk)
+
+    @staticmethod
+    def parallel_cipher(text, cipher, key, decrypt=False, workers=None, chunk_size=None, trace=False):
+        _count('chars', len(text))
+        chunk_size = chunk_size or CriptoMath.PARALLEL_CHUNK_SIZE
+        # Valida la llave en el proceso principal antes de repartir trabajo
+        CriptoMath._chunk_cipher(cipher, key, decrypt)
+        chunks = [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)]
+        # Desplazamiento de llave de cada fragmento = letras que lo preceden
+        offsets, letters = [], 0
+        for chunk in chunks:
+            offsets.append(letters)
+            if cipher == 'vigenere':
+                letters += CriptoMath._count_letters(chunk)
+        n = len(chunks)
+        if workers == 1 or n <= 1:
+            parts = map(CriptoMath._parallel_worker, chunks, [cipher] * n, [key] * n, [decrypt] * n, offsets)
+            result = ''.join(parts)
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                result = ''.join(pool.map(CriptoMath._parallel_worker, chunks, [cipher] * n, [key] * n, [decrypt] * n, offsets))
+        steps = CriptoMath._cipher_steps(text, result, cipher, key, decrypt)
+        return {'result': result, 'steps': CriptoMath._trace(steps, trace)}
+
+    @staticmethod
+    def _cipher_steps(text, result, cipher, key, decrypt):
+        if cipher == 'caesar':
+            return CriptoMath._caesar_steps(text, result, key, decrypt)
+        if cipher == 'affine':
+            return CriptoMath._affine_steps(text, result, *key, decrypt)
+        return CriptoMath._vigenere_steps(text, result, CriptoMath._vigenere_key(key), decrypt)
+
+    @staticmethod
+    def run_cipher(text, cipher, key, decrypt=False, trace=True, progress=None, chunk_size=None, out=None):
+        # Equivale a caesar_cipher / affine_cipher / vigenere_cipher / one_time_pad_cipher
+        # ('otp'), pero procesa el texto por fragmentos y llama a progress(hechos, total)
+        # entre uno y otro. Si progress lanza una excepción, la operación se interrumpe.
+        chunk_size = chunk_size or CriptoMath.CHUNK_SIZE
+        if cipher == 'otp':
+            CriptoMath._otp_check(text, key)
+            cipher = 'vigenere'
+        if out is not None or not isinstance(text, str):
+            return CriptoMath._bytes_cipher(text, cipher, key, decrypt, trace, out, progress, chunk_size)
+        _count('chars', len(text))
+        process = CriptoMath._chunk_cipher(cipher, key, decrypt)
+        parts, total = [], len(text)
+        for i in range(0, total, chunk_size):
+            parts.append(process(text[i:i + chunk_size]))
+            if progress: progress(min(i + chunk_size, total), total)
+        result = ''.join(parts)
+        steps = CriptoMath._cipher_steps(text, result, cipher, key, decrypt)
+        return {'result': result, 'steps': CriptoMath._trace(steps, trace)}
+
+    @staticmethod
+    def _rsa_crt_steps(c, m, key, out_label):
+        # Garner da 0 <= m < N con m ≡ m₁ (mod p) y m ≡ m₂ (mod q): las mitades se recuperan
+        # del resultado sin repetir las exponenciaciones del descifrado
+        m1, m2 = m % key.p, m % key.q
+        yield (f"c={c}", f"m₁ = {c}^{key.dp} mod {key.p}", f"m₁ = {m1}")
+        yield ("", f"m₂ = {c}^{key.dq} mod {key.q}", f"m₂ = {m2}")
+        yield ("", f"m = m₂ + {key.q}·({key.qinv}·(m₁ - m₂) mod {key.p})", out_label)
+
+    @staticmethod
+    def _rsa_steps(inputs, outputs, N, key, mode):
+        for x, y in zip(inputs, outputs):
+            if mode == 'enc':
+                yield (f"'{x}' (m={ord(x)})", f"c = {ord(x)}^{key} mod {N}", f"c = {y}")
+            elif isinstance(key, RSAPrivateKey):
+                yield from CriptoMath._rsa_crt_steps(x, ord(y), key, f"m = {ord(y)} ('{y}')")
+            else:
+                yield (f"c={x}", f"m = {x}^{key} mod {N}", f"m = {ord(y)} ('{y}')")
+
+    @staticmethod
+    def _rsa_block_steps(inputs, outputs, N, key, mode):
+        for i, (x, y) in enumerate(zip(inputs, outputs), 1):
+            if mode == 'enc':
+                yield (f"Bloque {i} (m={x})", f"c = {x}^{key} mod {N}", f"c = {y}")
+            elif isinstance(key, RSAPrivateKey):
+                yield from CriptoMath._rsa_crt_steps(x, y, key, f"Bloque {i} (m={y})")
+            else:
+                yield (f"c={x}", f"m = {x}^{key} mod {N}", f"Bloque {i} (m={y})")
+
+    @staticmethod
+    def rsa_block_size(N):
+        # Bytes por bloque: el mayor k con 256^k <= N, para que todo bloque sea < N
+        k = (N.bit_length() - 1) // 8
+        if k < 1: raise ValueError(f"N={N} es demasiado pequeño para el modo por bloques (se requiere N >= 256).")
+        return k
+
+    @staticmethod
+    def rsa_pack_blocks(data, N):
+        # Relleno reversible: 0x80 seguido de ceros hasta completar el último bloque
+        k = CriptoMath.rsa_block_size(N)
+        data = bytes(data) + b'\x80'
+        data += b'\x00' * (-len(data) % k)
+        return [int.from_bytes(data[i:i + k], 'big') for i in range(0, len(data), k)]
+
+    @staticmethod
+    def rsa_unpack_blocks(blocks, N):
+        k = CriptoMath.rsa_block_size(N)
+        try:
+            data = b''.join(m.to_bytes(k, 'big') for m in blocks).rstrip(b'\x00')
+        except OverflowError:
+            raise ValueError("Un bloque descifrado no cabe en el tamaño de bloque: ¿llave incorrecta?")
+        if not data.endswith(b'\x80'):
+            raise ValueError("Relleno de bloques inválido: ¿llave o texto cifrado incorrectos?")
+        return data[:-1]
+
+    @staticmethod
+    def _rsa_parse(text):
+        try:
+            return [int(n.strip()) for n in text.split(',') if n.strip()]
+        except (ValueError, TypeError):
+            raise ValueError("El texto cifrado debe ser una lista de números separados por comas.")
+
+    # Contenedor binario: cabecera (magia, bits de N, número de bloques) seguida de bloques
+    # big-endian de ancho fijo, el número de bytes de N.
+    _RSA_HEADER = struct.Struct('>4sIQ')
+    RSA_MAGIC = b'CSR1'
+    # 'Q1NS' es el base64 de b'CSR': identifica el contenedor codificado sin decodificarlo
+    _RSA_B64_PREFIX = 'Q1NS'
+    RSA_FORMATS = ('decimal', 'binary', 'base64')
+
+    @staticmethod
+    def _rsa_check_format(fmt):
+        if fmt not in CriptoMath.RSA_FORMATS:
+            raise ValueError(f"Formato desconocido: '{fmt}'. Use 'decimal', 'binary' o 'base64'.")
+
+    @staticmethod
+    def rsa_encode_blocks(values, N, fmt='binary'):
+        # fmt: 'binary' (bytes), 'base64' (str con el contenedor binario) o 'decimal' (legado)
+        CriptoMath._rsa_check_format(fmt)
+        if fmt == 'decimal':
+            return ",".join(map(str, values))
+        width = (N.bit_length() + 7) // 8
+        return CriptoMath._rsa_pack([v.to_bytes(width, 'big') for v in values], N, fmt)
+
+    @staticmethod
+    def _rsa_pack(blocks, N, fmt):
+        # Contenedor binario: cabecera y bloques ya convertidos a bytes de ancho fijo; en
+        # base64 si fmt lo pide
+        data = CriptoMath._RSA_HEADER.pack(CriptoMath.RSA_MAGIC, N.bit_length(), len(blocks)) + b''.join(blocks)
+        return base64.b64encode(data).decode('ascii') if fmt == 'base64' else data
+
+    @staticmethod
+    def rsa_decode_blocks(data, N):
+        # Acepta el contenedor binario (bytes, bytearray o memoryview), su versión base64 o
+        # la lista decimal separada por comas. Los bloques se leen sobre un memoryview.
+        if isinstance(data, str):
+            if not data.lstrip().startswith(CriptoMath._RSA_B64_PREFIX):
+                return CriptoMath._rsa_parse(data)
+            try:
+                data = base64.b64decode(data.strip(), validate=True)
+            except ValueError:
+                raise ValueError("El texto cifrado en base64 no es válido.")
+        view = memoryview(data).cast('B')
+        header = CriptoMath._RSA_HEADER
+        if len(view) < header.size or view[:4] != CriptoMath.RSA_MAGIC:
+            raise ValueError("El texto cifrado no es un contenedor RSA binario válido.")
+        _, bits, count = header.unpack_from(view)
+        if bits != N.bit_length():
+            raise ValueError(f"El texto cifrado es para un N de {bits} bits, pero N tiene {N.bit_length()}.")
+        width = (bits + 7) // 8
+        if len(view) != header.size + count * width:
+            raise ValueError(f"El contenedor declara {count} bloques pero su tamaño no coincide.")
+        return [int.from_bytes(view[i:i + width], 'big') for i in range(header.size, len(view), width)]
+
+    @staticmethod
+    def _rsa_apply(values, N, key, progress=None):
+        # Una exponenciación modular por valor; key es un exponente o un RSAPrivateKey (TCR)
+        crt = isinstance(key, RSAPrivateKey)
+        result, total = [], len(values)
+        # Con TCR cada valor cuesta dos exponenciaciones de medio tamaño
+        _count('blocks', total); _count('modexp', total * (2 if crt else 1))
+        for i, x in enumerate(values, 1):
+            result.append(key.decrypt_int(x) if crt else CriptoMath.power(x, key, N))
+            if progress and (i % 64 == 0 or i == total): progress(i, total)
+        return result
+
+    @staticmethod
+    def rsa_cipher(text, N, key, mode, trace=True, block=False, progress=None, fmt='decimal'):
+        # Para descifrar, key puede ser el exponente d o un RSAPrivateKey (descifrado por TCR).
+        # block=True cifra los bytes UTF-8 del mensaje en bloques de rsa_block_size(N) bytes.
+        # fmt elige el formato del texto cifrado (ver rsa_encode_blocks); al descifrar se detecta.
+        CriptoMath._rsa_check_format(fmt)
+        if block:
+            return CriptoMath._rsa_block_cipher(text, N, key, mode, trace, progress, fmt)
         if mode == 'enc':
-            result = []
             for char in text:
                 m = ord(char)
                 if m >= N: raise ValueError(f"El valor ASCII de '{char}' ({m}) es >= N ({N}). Use primos p,q más grandes.")
-                c = CriptoMath.power(m, key, N)
-                result.append(str(c))
-                steps.append((f"'{char}' (m={m})", f"c = {m}^{key} mod {N}", f"c = {c}"))
-            return {'result': ",".join(result), 'steps': steps}
+            result = CriptoMath._rsa_apply([ord(char) for char in text], N, key, progress)
+            steps = CriptoMath._trace(CriptoMath._rsa_steps(text, result, N, key, mode), trace)
+            return {'result': CriptoMath.rsa_encode_blocks(result, N, fmt), 'steps': steps}
         else: # dec
-            result = ''
-            try:
-                cipher_nums = [int(n.strip()) for n in text.split(',') if n.strip()]
-            except (ValueError, TypeError):
-                raise ValueError("El texto cifrado debe ser una lista de números separados por comas.")
-            
-            for c in cipher_nums:
-                m = CriptoMath.power(c, key, N)
-                char = chr(m)
-                result += char
-                steps.append((f"c={c}", f"m = {c}^{key} mod {N}", f"m = {m} ('{char}')"))
+            cipher_nums = CriptoMath.rsa_decode_blocks(text, N)
+            result = ''.join(map(chr, CriptoMath._rsa_apply(cipher_nums, N, key, progress)))
+            steps = CriptoMath._trace(CriptoMath._rsa_steps(cipher_nums, result, N, key, mode), trace)
             return {'result': result, 'steps': steps}
+
+    @staticmethod
+    def _rsa_block_cipher(text, N, key, mode, trace, progress=None, fmt='decimal'):
+        if mode == 'enc':
+            blocks = CriptoMath.rsa_pack_blocks(text.encode('utf-8'), N)
+            result = CriptoMath._rsa_apply(blocks, N, key, progress)
+            steps = CriptoMath._trace(CriptoMath._rsa_block_steps(blocks, result, N, key, mode), trace)
+            return {'result': CriptoMath.rsa_encode_blocks(result, N, fmt), 'steps': steps}
+        cipher_nums = CriptoMath.rsa_decode_blocks(text, N)
+        blocks = CriptoMath._rsa_apply(cipher_nums, N, key, progress)
+        try:
+            result = CriptoMath.rsa_unpack_blocks(blocks, N).decode('utf-8')
+        except UnicodeDecodeError:
+            raise ValueError("Los bloques descifrados no forman texto UTF-8 válido: ¿llave incorrecta?")
+        steps = CriptoMath._trace(CriptoMath._rsa_block_steps(cipher_nums, blocks, N, key, mode), trace)
+        return {'result': result, 'steps': steps}
             
+    # --- Lotes: muchos mensajes con una misma llave ---
+
+    @staticmethod
+    def _rsa_batch_processor(N, key, mode, block, fmt='decimal'):
+        # En modo por carácter cada símbolo se cifra siempre igual: se memoizan las
+        # exponenciaciones (carácter -> bloque codificado y número -> carácter) entre mensajes.
+        CriptoMath._rsa_check_format(fmt)
+        if block:
+            return lambda text: CriptoMath._rsa_block_cipher(text, N, key, mode, False, None, fmt)['result']
+        crt = isinstance(key, RSAPrivateKey)
+        memo, limit = {}, CriptoMath.BATCH_MEMO_LIMIT
+        if mode == 'enc':
+            width = (N.bit_length() + 7) // 8
+            encode = str if fmt == 'decimal' else lambda c: c.to_bytes(width, 'big')
+            def process(text):
+                out = []
+                for char in text:
+                    c = memo.get(char)
+                    if c is None:
+                        m = ord(char)
+                        if m >= N: raise ValueError(f"El valor ASCII de '{char}' ({m}) es >= N ({N}). Use primos p,q más grandes.")
+                        c = encode(CriptoMath.power(m, key, N)); _count('modexp')
+                        if len(memo) < limit: memo[char] = c
+                    out.append(c)
+                return ','.join(out) if fmt == 'decimal' else CriptoMath._rsa_pack(out, N, fmt)
+            return process
+        def process(text):
+            out = []
+            for c in CriptoMath.rsa_decode_blocks(text, N):
+                char = memo.get(c)
+                if char is None:
+                    char = chr(key.decrypt_int(c) if crt else CriptoMath.power(c, key, N)); _count('modexp', 2 if crt else 1)
+                    if len(memo) < limit: memo[c] = char
+                out.append(char)
+            return ''.join(out)
+        return process
+
+    @staticmethod
+    def _batch_processor(cipher, key, decrypt=False, block=False, fmt='decimal'):
+        # Prepara la llave una sola vez y devuelve una función mensaje -> resultado.
+        # key: b (César), (a, b) (Afín), la llave de texto (Vigenère) o (N, exponente |
+        # RSAPrivateKey) para 'rsa', donde decrypt elige entre 'enc' y 'dec'.
+        if cipher in ('caesar', 'affine'):
+            return CriptoMath._chunk_cipher(cipher, key, decrypt)
+        if cipher == 'vigenere':
+            # Cada mensaje empieza desde la primera letra de la llave
+            prepared = CriptoMath._vigenere_prepare(CriptoMath._vigenere_key(key), decrypt)
+            return lambda text: CriptoMath._vigenere_chunk(text, prepared)[0]
+        if cipher == 'rsa':
+            N, exponent = key
+            return CriptoMath._rsa_batch_processor(N, exponent, 'dec' if decrypt else 'enc', block, fmt)
+        if cipher == 'otp':
+            raise ValueError("El one-time pad no admite lotes: cada mensaje necesita su propia llave.")
+        raise ValueError(f"Cifrado desconocido: '{cipher}'. Use 'caesar', 'affine', 'vigenere' o 'rsa'.")
+
+    @staticmethod
+    def batch_cipher(messages, cipher, key, decrypt=False, block=False, fmt='decimal'):
+        # Genera los resultados en el mismo orden que los mensajes, sin acumularlos.
+        # fmt solo afecta al cifrado RSA (ver rsa_encode_blocks). La llave se valida al
+        # llamar, antes de consumir ningún mensaje.
+        process = CriptoMath._batch_processor(cipher, key, decrypt, block, fmt)
+        return CriptoMath._batch_results(messages, process)
+
+    @staticmethod
+    def _batch_results(messages, process):
+        chars = 0
+        try:
+            for text in messages:
+                chars += len(text)
+                yield process(text)
+        finally:
+            _count('chars', chars)
+
+    @staticmethod
+    def batch_file(in_path, out_path, cipher, key, decrypt=False, block=False, field='text', lines=False, fmt='decimal'):
+        # Entrada JSONL: cada línea es un objeto con el mensaje en `field` (o una cadena JSON)
+        # y la salida repite el registro con 'result', o con 'error' si ese registro falla.
+        # Con lines=True cada línea es un mensaje en texto plano y la salida, su resultado.
+        if fmt == 'binary':
+            raise ValueError("Los archivos de lotes son texto: use fmt='base64' para el contenedor binario.")
+        process = CriptoMath._batch_processor(cipher, key, decrypt, block, fmt)
+        count = 0
+        with open(in_path, encoding='utf-8', errors='surrogateescape', newline='') as src, \
+             open(out_path, 'w', encoding='utf-8', errors='surrogateescape', newline='') as dst:
+            for number, line in enumerate(src, 1):
+                if lines:
+                    text = line[:-1] if line.endswith('\n') else line
+                    dst.write(process(text) + '\n')
+                    count += 1
+                    continue
+                if not line.strip(): continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"Línea {number}: JSON inválido ({e.msg}).")
+                if not isinstance(record, dict):
+                    record = {field: record}
+                try:
+                    text = record[field]
+                    if not isinstance(text, str): raise ValueError(f"El campo '{field}' debe ser texto.")
+                    record['result'] = process(text)
+                except KeyError:
+                    record['error'] = f"Falta el campo '{field}'."
+                except ValueError as e:
+                    record['error'] = str(e)
+                dst.write(json.dumps(record, ensure_ascii=False) + '\n')
+                count += 1
+        _count('records', count)
+        return count
+
     @staticmethod
     def euclides_algorithm(initial_a, initial_b):
         steps = []
@@ -181,536 +1285,631 @@ class CriptoMath:
         return {'result': result, 'steps': steps}
 
     @staticmethod
-    def chinese_remainder_theorem(congruences):
-        steps = []
-        if len(congruences) < 2:
-            raise ValueError("Se necesitan al menos dos congruencias.")
-
-        moduli = [n for r, n in congruences]
-        for i in range(len(moduli)):
-            if moduli[i] <= 1:
-                raise ValueError(f"El módulo n_{i+1}={moduli[i]} debe ser > 1.")
-            for j in range(i + 1, len(moduli)):
-                if CriptoMath.mcd(moduli[i], moduli[j]) != 1:
-                    raise ValueError(f"Módulos no coprimos: mcd({moduli[i]}, {moduli[j]}) = {CriptoMath.mcd(moduli[i], moduli[j])} ≠ 1.")
-        
-        r1, n1 = congruences[0]
-        for i in range(1, len(congruences)):
-            r2, n2 = congruences[i]
-            steps.append((f"Resolviendo sistema parcial:", "", ""))
-            steps.append((f"n ≡ {r1} (mod {n1})", "", ""))
-            steps.append((f"n ≡ {r2} (mod {n2})", "", ""))
-
-            g, x, y = CriptoMath.egcd(n1, n2)
-            steps.append(("Usar Euclides Extendido", f"1 = {n1}({x}) + {n2}({y})", f"x={x}, y={y}"))
-
-            n12 = r1 * y * n2 + r2 * x * n1
-            steps.append(("Calcular n_1,2", f"r₁*y*n₂ + r₂*x*n₁", f"= {n12}"))
-
-            new_mod = n1 * n2
-            # CORRECCIÓN: Asegurar que el resultado del módulo sea positivo
-            r1 = (n12 % new_mod + new_mod) % new_mod
-            n1 = new_mod
-            steps.append(("Nueva congruencia", f"n ≡ {n12} (mod {new_mod})", f"n ≡ {r1} (mod {n1})"))
-
-        N = math.prod(moduli)
-        result_str = f"n ≡ {r1} (mod {N})"
-        return {'result': result_str, 'steps': steps}
-
-# =================================================================================================
-# SECCIÓN 2: APLICACIÓN PRINCIPAL (GUI con TKINTER)
-# =================================================================================================
-class CriptoSuiteApp(tk.Tk):
-    def __init__(self):
-        super().__init__()
-        self.title("CriptoSuite Profesional (Python Edition)")
-        self.geometry("1200x750")
-        self.minsize(1000, 600)
-
-        # --- Estilo y Fuentes ---
-        self.style = ttk.Style(self)
+    def _int_str(n):
+        # Los enteros que superan el límite de conversión decimal de Python se muestran en hex
         try:
-            # Intenta usar un tema moderno si está disponible
-            from sv_ttk import set_theme
-            set_theme("light")
-        except ImportError:
-            self.style.theme_use('clam')
+            return str(n)
+        except ValueError:
+            return hex(n)
 
-        self.font_normal = font.nametofont("TkDefaultFont")
-        self.font_bold = self.font_normal.copy(); self.font_bold.configure(weight="bold")
-        self.font_title = self.font_normal.copy(); self.font_title.configure(size=16, weight="bold")
-        self.font_result = font.Font(family="Consolas", size=14, weight="bold")
-        self.font_small = self.font_normal.copy(); self.font_small.configure(size=9)
-        
-        self.configure(bg="#f3f4f6")
-        self.style.configure("TFrame", background="#f3f4f6")
-        self.style.configure("Card.TFrame", background="white", relief="solid", borderwidth=1, bordercolor="#d1d5db")
-        self.style.configure("TLabel", background="#f3f4f6")
-        self.style.configure("Card.TLabel", background="white")
-        self.style.configure("Header.TLabel", font=self.font_title, foreground="#007aff", background="white")
-        self.style.configure("Result.TLabel", font=self.font_result, background="#f3f4f6")
-        self.style.configure("Success.TLabel", foreground="#10b981", background="white")
-        self.style.configure("Error.TLabel", foreground="#ef4444", background="white")
-        self.style.configure("Treeview", rowheight=28, fieldbackground="white")
-        self.style.configure("Treeview.Heading", font=self.font_bold)
-        self.style.configure("TNotebook", borderwidth=0)
-        self.style.layout("TNotebook.Tab", []) # Ocultar tabs
-
-        self._create_layout()
-
-    def _create_layout(self):
-        # Layout principal (Sidebar + Contenido)
-        self.grid_rowconfigure(0, weight=1)
-        self.grid_columnconfigure(1, weight=1)
-
-        # --- Sidebar de Navegación ---
-        sidebar = ttk.Frame(self, width=250, style="Card.TFrame")
-        sidebar.grid(row=0, column=0, sticky="ns", padx=(10,0), pady=10)
-        sidebar.grid_propagate(False)
-        
-        ttk.Label(sidebar, text="CriptoSuite", style="Header.TLabel").pack(pady=20, padx=20, anchor='w')
-
-        self.nav_buttons = {}
-        self.notebook = ttk.Notebook(self, style="TNotebook")
-        self.notebook.grid(row=0, column=1, sticky="nsew", padx=10, pady=10)
-        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_change)
-
-        # Definición de herramientas
-        tools = [
-            ("Cifrado César", self._setup_cesar_ui),
-            ("Cifrado Afín", self._setup_afin_ui),
-            ("Euclides y MCD", self._setup_euclides_ui),
-            ("Inverso Modular", self._setup_inverso_ui),
-            ("T. Chino Residuo", self._setup_tcr_ui),
-            None, # Separador
-            ("C. Vigenère", self._setup_vigenere_ui),
-            ("One-Time Pad", self._setup_otp_ui),
-            ("Criptosistema RSA", self._setup_rsa_ui)
-        ]
-
-        # Mapeo de índices de notebook a índices de botones (saltando el separador)
-        self.button_map = {i if i < 5 else i-1: i for i in range(len(tools))}
-
-        for i, tool_info in enumerate(tools):
-            if tool_info is None:
-                ttk.Separator(sidebar).pack(fill='x', padx=20, pady=10)
-                continue
-            
-            name, setup_func = tool_info
-            
-            # Crear botón de navegación
-            btn_index = i if i < 5 else i -1 # Ajustar índice por el separador
-            btn = ttk.Button(sidebar, text=name, command=lambda index=len(self.notebook.tabs()): self.notebook.select(index))
-            btn.pack(fill='x', padx=20, pady=2)
-            self.nav_buttons[btn_index] = btn
-            
-            # Crear el frame para la herramienta (la "pestaña")
-            tool_frame = ttk.Frame(self.notebook)
-            self.notebook.add(tool_frame, text=name)
-            
-            # poblar la pestaña con sus controles y salidas
-            controls, output = self._create_base_panels(tool_frame)
-            ttk.Label(controls, text=name, style="Header.TLabel").pack(pady=(0, 20), padx=20, anchor='w')
-            setup_func(controls, output)
-            
-        self._on_tab_change() # Seleccionar el primer botón
-
-    def _on_tab_change(self, event=None):
-        current_index = self.notebook.index(self.notebook.select())
-        for index, button in self.nav_buttons.items():
-            button.state(["pressed"] if index == current_index else ["!pressed"])
-
-    def _create_base_panels(self, parent):
-        parent.grid_columnconfigure(1, weight=1)
-        parent.grid_rowconfigure(0, weight=1)
-        
-        controls = ttk.Frame(parent, style="Card.TFrame", width=380)
-        controls.grid(row=0, column=0, sticky="ns", pady=10, padx=(10,5))
-        controls.pack_propagate(False)
-
-        output = ttk.Frame(parent, style="TFrame")
-        output.grid(row=0, column=1, sticky="nsew", pady=10, padx=(5,10))
-        output.grid_rowconfigure(2, weight=1)
-        output.grid_columnconfigure(0, weight=1)
-        
-        return controls, output
-
-    # --- Constructores de UI para cada Herramienta ---
-
-    def _setup_cesar_ui(self, controls, output):
-        ttk.Label(controls, text="Texto:", style="Card.TLabel", font=self.font_bold).pack(anchor='w', padx=20)
-        text_in = tk.Text(controls, height=5, font=self.font_normal, relief='solid', borderwidth=1, highlightthickness=1)
-        text_in.pack(fill='x', padx=20, pady=5)
-        text_in.insert("1.0", "HELLO WORLD")
-        
-        ttk.Label(controls, text="Shift (b):", style="Card.TLabel", font=self.font_bold).pack(anchor='w', padx=20, pady=(10,0))
-        b_in = ttk.Entry(controls); b_in.pack(fill='x', padx=20, pady=5); b_in.insert(0, "3")
-
-        mode, result_text, steps_tree = self._common_widgets(controls, output, ["Entrada", "Cálculo", "Salida"])
-
-        def execute():
-            try:
-                b_val = int(b_in.get())
-                if b_val < 0:
-                    raise ValueError("El shift 'b' no puede ser negativo.")
-                res = CriptoMath.caesar_cipher(text_in.get("1.0", "end-1c"), b_val, mode.get()=='dec')
-                result_text.config(text=res['result'])
-                self._update_tree(steps_tree, res['steps'])
-            except ValueError as e: 
-                messagebox.showerror("Error de Entrada", f"Valor inválido para 'b'.\n{e}")
-            except Exception as e: 
-                messagebox.showerror("Error", str(e))
-            
-        ttk.Button(controls, text="Ejecutar", command=execute).pack(fill='x', side='bottom', padx=20, pady=20)
-
-    def _setup_afin_ui(self, controls, output):
-        ttk.Label(controls, text="Texto:", style="Card.TLabel", font=self.font_bold).pack(anchor='w', padx=20)
-        text_in = tk.Text(controls, height=5, font=self.font_normal, relief='solid', borderwidth=1, highlightthickness=1)
-        text_in.pack(fill='x', padx=20, pady=5); text_in.insert("1.0", "AFFINE CIPHER")
-        
-        ttk.Label(controls, text="Parámetro (a):", style="Card.TLabel", font=self.font_bold).pack(anchor='w', padx=20, pady=(10,0))
-        coprimes = [1, 3, 5, 7, 9, 11, 15, 17, 19, 21, 23, 25]
-        a_in = ttk.Combobox(controls, values=coprimes, state="readonly"); a_in.pack(fill='x', padx=20, pady=5); a_in.set(5)
-        
-        ttk.Label(controls, text="Parámetro (b):", style="Card.TLabel", font=self.font_bold).pack(anchor='w', padx=20, pady=(10,0))
-        b_in = ttk.Entry(controls); b_in.pack(fill='x', padx=20, pady=5); b_in.insert(0, "8")
-        
-        mode, result_text, steps_tree = self._common_widgets(controls, output, ["Entrada", "Cálculo", "Salida"])
-
-        def execute():
-            try:
-                b_val = int(b_in.get())
-                if b_val < 0:
-                    raise ValueError("El parámetro 'b' no puede ser negativo.")
-                res = CriptoMath.affine_cipher(text_in.get("1.0", "end-1c"), int(a_in.get()), b_val, mode.get()=='dec')
-                result_text.config(text=res['result'])
-                self._update_tree(steps_tree, res['steps'])
-            except ValueError as e: 
-                messagebox.showerror("Error de Entrada", f"Valor inválido para 'b'.\n{e}")
-            except Exception as e: 
-                messagebox.showerror("Error", str(e))
-        
-        ttk.Button(controls, text="Ejecutar", command=execute).pack(fill='x', side='bottom', padx=20, pady=20)
-
-    def _setup_vigenere_ui(self, controls, output):
-        ttk.Label(controls, text="Texto:", style="Card.TLabel", font=self.font_bold).pack(anchor='w', padx=20)
-        text_in = tk.Text(controls, height=5, font=self.font_normal, relief='solid', borderwidth=1, highlightthickness=1)
-        text_in.pack(fill='x', padx=20, pady=5); text_in.insert("1.0", "ATTACK AT DAWN")
-
-        ttk.Label(controls, text="Llave (k):", style="Card.TLabel", font=self.font_bold).pack(anchor='w', padx=20, pady=(10,0))
-        key_in = ttk.Entry(controls); key_in.pack(fill='x', padx=20, pady=5); key_in.insert(0, "LEMON")
+    @staticmethod
+    def _product_tree(values):
+        levels = [list(values)]
+        while len(levels[-1]) > 1:
+            prev = levels[-1]
+            levels.append([prev[i] * prev[i + 1] if i + 1 < len(prev) else prev[i] for i in range(0, len(prev), 2)])
+        return levels
 
-        mode, result_text, steps_tree = self._common_widgets(controls, output, ["Entrada", "Llave", "Shift", "Cálculo", "Salida"])
+    @staticmethod
+    def find_non_coprime(moduli):
+        # Árbol de productos y de restos: con P = ∏ n_i, (P mod n_i²) / n_i = (P / n_i) mod n_i,
+        # así que n_i es coprimo con los demás si y solo si mcd(n_i, (P mod n_i²) / n_i) = 1.
+        # Devuelve None si son coprimos en pares, o un par (n_i, n_j) con mcd > 1.
+        if len(moduli) < 2: return None
+        P = CriptoMath._product_tree(moduli)[-1][0]
+        squares = CriptoMath._product_tree([n * n for n in moduli])
+        rems = [P % squares[-1][0]]
+        for level in reversed(squares[:-1]):
+            rems = [rems[i // 2] % level[i] for i in range(len(level))]
+        for i, (n, rem) in enumerate(zip(moduli, rems)):
+            if CriptoMath.mcd(n, rem // n) != 1:
+                j = next(j for j, m in enumerate(moduli) if j != i and CriptoMath.mcd(n, m) != 1)
+                return (n, moduli[j])
+        return None
 
-        def execute():
-            try:
-                res = CriptoMath.vigenere_cipher(text_in.get("1.0", "end-1c"), key_in.get(), mode.get()=='dec')
-                result_text.config(text=res['result'])
-                self._update_tree(steps_tree, res['steps'])
-            except Exception as e: messagebox.showerror("Error", str(e))
-        
-        ttk.Button(controls, text="Ejecutar", command=execute).pack(fill='x', side='bottom', padx=20, pady=20)
+    @staticmethod
+    def _crt_merge(c1, c2):
+        # Combina n ≡ r1 (mod n1) y n ≡ r2 (mod n2) en una congruencia módulo mcm(n1, n2)
+        (r1, n1), (r2, n2) = c1, c2
+        g, x, _ = CriptoMath.egcd(n1, n2)
+        if (r2 - r1) % g:
+            raise ValueError(f"Sistema inconsistente: n ≡ {r1} (mod {n1}) y n ≡ {r2} (mod {n2}) no tienen solución (mcd={g} no divide {r2 - r1}).")
+        n2g = n2 // g
+        lcm = n1 * n2g
+        r = (r1 + n1 * ((r2 - r1) // g * x % n2g)) % lcm
+        return (r, lcm), x
 
-    def _setup_otp_ui(self, controls, output):
-        ttk.Label(controls, text="Mensaje:", style="Card.TLabel", font=self.font_bold).pack(anchor='w', padx=20)
-        text_in = tk.Text(controls, height=5, font=self.font_normal, relief='solid', borderwidth=1, highlightthickness=1)
-        text_in.pack(fill='x', padx=20, pady=5); text_in.insert("1.0", "SECRET MESSAGE")
+    @staticmethod
+    def _crt_steps(check, merges):
+        if check is None:
+            yield ("Verificar módulos", "Árbol de productos y restos", "Coprimos en pares")
+        else:
+            yield ("Verificar módulos", f"mcd({check[0]}, {check[1]}) ≠ 1", "Se resuelve módulo el mcm")
+        s = CriptoMath._int_str
+        for (r1, n1), (r2, n2), x, (r, n) in merges:
+            yield ("Combinar", f"n ≡ {s(r1)} (mod {s(n1)}), n ≡ {s(r2)} (mod {s(n2)})", "")
+            yield ("", f"{s(n1)}·{s(x)} ≡ mcd({s(n1)}, {s(n2)}) (mod {s(n2)})", f"x={s(x)}")
+            yield ("Nueva congruencia", f"n ≡ {s(r1)} + {s(n1)}·k (mod {s(n)})", f"n ≡ {s(r)} (mod {s(n)})")
 
-        ttk.Label(controls, text="Llave (k):", style="Card.TLabel", font=self.font_bold).pack(anchor='w', padx=20, pady=(10,0))
-        key_in = ttk.Entry(controls); key_in.pack(fill='x', padx=20, pady=5)
-        
-        val_label = ttk.Label(controls, font=self.font_small, style="Card.TLabel"); val_label.pack(anchor='w', padx=20)
+    @staticmethod
+    def chinese_remainder_theorem(congruences, trace=True):
+        # Resuelve el sistema combinando congruencias por pares en un árbol balanceado, de
+        # modo que los módulos intermedios crecen de forma pareja. Admite módulos no coprimos:
+        # el resultado es módulo el mcm, o un ValueError si el sistema es inconsistente.
+        _count('congruences', len(congruences))
+        if len(congruences) < 2:
+            raise ValueError("Se necesitan al menos dos congruencias.")
 
-        exec_btn = ttk.Button(controls, text="Ejecutar")
-        
-        def validate(*args):
-            text_len = len(''.join(filter(str.isalpha, text_in.get("1.0", "end-1c"))))
-            key_len = len(''.join(filter(str.isalpha, key_in.get())))
-            if text_len == 0 and key_len == 0:
-                val_label.config(text="")
-                exec_btn.config(state="disabled")
-                return
-            if text_len == key_len:
-                val_label.config(text=f"Correcto: Longitudes coinciden ({text_len})", style="Success.TLabel")
-                exec_btn.config(state="normal")
+        moduli = [n for r, n in congruences]
+        for i, n in enumerate(moduli):
+            if n <= 1:
+                raise ValueError(f"El módulo n_{i+1}={n} debe ser > 1.")
+        check = CriptoMath.find_non_coprime(moduli) if trace else None
+
+        merges = []
+        level = [(r % n, n) for r, n in congruences]
+        while len(level) > 1:
+            merged = []
+            for i in range(0, len(level) - 1, 2):
+                combined, x = CriptoMath._crt_merge(level[i], level[i + 1])
+                if trace: merges.append((level[i], level[i + 1], x, combined))
+                merged.append(combined)
+            if len(level) % 2: merged.append(level[-1])
+            level = merged
+
+        r, N = level[0]
+        result_str = f"n ≡ {CriptoMath._int_str(r)} (mod {CriptoMath._int_str(N)})"
+        return {'result': result_str, 'solution': (r, N), 'steps': CriptoMath._trace(CriptoMath._crt_steps(check, merges), trace)}
+
+class RSAPrivateKey:
+    # Clave privada RSA con las componentes del TCR precalculadas (dp, dq, qinv). El
+    # descifrado hace dos exponenciaciones de la mitad de tamaño y las recombina (Garner).
+    def __init__(self, p, q, e):
+        if p == q: raise ValueError("p y q no pueden ser iguales.")
+        self.p, self.q, self.e = p, q, e
+        self.N = p * q
+        self.d = CriptoMath.modinv(e, (p - 1) * (q - 1))
+        # Con p = 2, d mod (p-1) = 0; el exponente p-1 da el mismo resultado que d
+        self.dp = self.d % (p - 1) or (p - 1)
+        self.dq = self.d % (q - 1) or (q - 1)
+        self.qinv = CriptoMath.modinv(q, p)
+
+    def half_powers(self, c):
+        return pow(c, self.dp, self.p), pow(c, self.dq, self.q)
+
+    def decrypt_int(self, c):
+        m1, m2 = self.half_powers(c)
+        h = (self.qinv * (m1 - m2)) % self.p
+        return m2 + h * self.q
+
+class StepRecords:
+    # Traza de un cifrado clásico sin filas preformateadas: solo referencias al texto de entrada
+    # y al de salida (un carácter por fila). format_row(entrada, salida, letras) construye la
+    # tupla de una fila cuando se lee (página del Treeview, --steps, exportación). Con
+    # count_letters, letras es el número de caracteres isalpha() hasta la fila inclusive; esa
+    # columna array('i') se extiende por tramos solo hasta la última fila leída. Se comporta
+    # como una lista de solo lectura: len, índices, cortes, iteración repetible y comparación.
+    __slots__ = ('_header', '_inputs', '_outputs', '_letters', '_format')
+    LETTER_CHUNK = 1 << 16
+
+    def __init__(self, inputs, outputs, format_row, header=(), count_letters=False):
+        self._header, self._inputs, self._outputs = tuple(header), inputs, outputs
+        self._letters, self._format = array('i') if count_letters else None, format_row
+
+    def __len__(self):
+        return len(self._header) + min(len(self._inputs), len(self._outputs))
+
+    def _letters_at(self, i):
+        letters = self._letters
+        if letters is None:
+            return 0
+        if i >= len(letters):
+            start = len(letters)
+            chunk = self._inputs[start:max(i + 1, start + self.LETTER_CHUNK)]
+            letters.extend(itertools.accumulate(map(str.isalpha, chunk), initial=letters[-1] if letters else 0))
+            # accumulate repite el valor inicial como primer elemento
+            del letters[start]
+        return letters[i]
+
+    def _row(self, i):
+        if i < len(self._header):
+            return self._header[i]
+        i -= len(self._header)
+        return self._format(self._inputs[i], self._outputs[i], self._letters_at(i))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._row(i) for i in range(*index.indices(len(self)))]
+        n = len(self)
+        if index < 0: index += n
+        if not 0 <= index < n: raise IndexError("Índice de paso fuera de rango.")
+        return self._row(index)
+
+    def __iter__(self):
+        yield from self._header
+        # El recorrido completo cuenta las letras sobre la marcha, sin llenar la columna
+        letters = itertools.repeat(0) if self._letters is None else itertools.accumulate(map(str.isalpha, self._inputs))
+        yield from map(self._format, self._inputs, self._outputs, letters)
+
+    def __eq__(self, other):
+        if not isinstance(other, (StepRecords, list, tuple)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"<StepRecords: {len(self)} pasos>"
+
+    def nbytes(self):
+        # Memoria propia de la traza (la columna de letras); los textos se comparten con la
+        # entrada y el resultado, y quien los guarde debe medirlos aparte
+        return 0 if self._letters is None else self._letters.itemsize * len(self._letters)
+
+    def _with_inputs(self, inputs):
+        # Misma traza sobre otra referencia al texto de entrada (None: sin entrada, para guardarla
+        # en caché); la columna de letras se vuelve a calcular a demanda
+        return StepRecords(inputs, self._outputs, self._format, self._header, self._letters is not None)
+
+class _ReplayableSteps:
+    # Traza diferida que puede recorrerse varias veces: las filas ya generadas se guardan y
+    # se repiten, y solo se pide al generador original lo que nadie ha leído todavía.
+    def __init__(self, steps):
+        self._source, self._rows = iter(steps), []
+
+    def __iter__(self):
+        i = 0
+        while True:
+            if i < len(self._rows):
+                yield self._rows[i]
             else:
-                val_label.config(text=f"Error: Longitudes deben ser iguales (M: {text_len}, K: {key_len})", style="Error.TLabel")
-                exec_btn.config(state="disabled")
-        
-        text_in.bind("<KeyRelease>", validate); key_in.bind("<KeyRelease>", validate)
-        
-        def generate_key():
-            text = ''.join(filter(str.isalpha, text_in.get("1.0", "end-1c")))
-            new_key = ''.join(random.choice(CriptoMath.ALPHABET) for _ in range(len(text)))
-            key_in.delete(0, tk.END); key_in.insert(0, new_key); validate()
-            
-        ttk.Button(controls, text="Generar Llave Aleatoria", command=generate_key).pack(fill='x', padx=20, pady=10)
-
-        mode, result_text, steps_tree = self._common_widgets(controls, output, ["Entrada", "Llave", "Shift", "Cálculo", "Salida"])
-
-        def execute():
-            try:
-                res = CriptoMath.one_time_pad_cipher(text_in.get("1.0", "end-1c"), key_in.get(), mode.get()=='dec')
-                result_text.config(text=res['result']); self._update_tree(steps_tree, res['steps'])
-            except Exception as e: messagebox.showerror("Error", str(e))
-        
-        exec_btn.config(command=execute); exec_btn.pack(fill='x', side='bottom', padx=20, pady=20)
-        validate()
-
-    def _setup_rsa_ui(self, controls, output):
-        # Frame de Generación
-        gen_frame = ttk.Frame(controls, style="Card.TFrame")
-        gen_frame.pack(fill='x', padx=20, pady=(0,10))
-        ttk.Label(gen_frame, text="1. Generación de Claves", style="Card.TLabel", font=self.font_bold).pack(anchor='w',pady=5)
-        
-        p_in = self._create_labeled_entry(gen_frame, "Primo (p):", "61")
-        q_in = self._create_labeled_entry(gen_frame, "Primo (q):", "53")
-        e_in = self._create_labeled_entry(gen_frame, "Exponente (e):", "17")
-        val_label = ttk.Label(gen_frame, font=self.font_small, style="Card.TLabel"); val_label.pack(anchor='w', pady=5)
-        
-        gen_btn = ttk.Button(gen_frame, text="Generar y Validar Claves")
-        gen_btn.pack(fill='x', pady=5)
-        
-        pub_key_out = self._create_labeled_entry(gen_frame, "Clave Pública (N,e):", "", readonly=True)
-        priv_key_out = self._create_labeled_entry(gen_frame, "Clave Privada (d):", "", readonly=True)
-
-        # Frame de Operación
-        op_frame = ttk.Frame(controls, style="Card.TFrame")
-        op_frame.pack(fill='x', expand=True, padx=20)
-        ttk.Label(op_frame, text="2. Operación", style="Card.TLabel", font=self.font_bold).pack(anchor='w', pady=5)
-        
-        ttk.Label(op_frame, text="Mensaje / Cifrado:", style="Card.TLabel").pack(anchor='w')
-        text_in = tk.Text(op_frame, height=4, font=self.font_normal, relief='solid', borderwidth=1, highlightthickness=1)
-        text_in.pack(fill='x', pady=5); text_in.insert("1.0", "RSA ENCRYPTED")
-
-        mode, result_text, steps_tree = self._common_widgets(op_frame, output, ["Entrada", "Cálculo", "Resultado"], show_mode=True)
-        exec_btn = ttk.Button(controls, text="Ejecutar", state='disabled')
-        exec_btn.pack(fill='x', side='bottom', padx=20, pady=20)
-        
-        rsa_params = {}
-        def validate_and_generate():
-            try:
-                p, q, e = int(p_in.get()), int(q_in.get()), int(e_in.get())
-                if not CriptoMath.is_prime(p): raise ValueError(f"p={p} no es primo.")
-                if not CriptoMath.is_prime(q): raise ValueError(f"q={q} no es primo.")
-                if p == q: raise ValueError("p y q no pueden ser iguales.")
-                phi_N = (p-1)*(q-1)
-                if not (1 < e < phi_N): raise ValueError(f"e={e} debe estar entre 1 y φ(N)={phi_N}.")
-                if CriptoMath.mcd(e, phi_N) != 1: raise ValueError(f"e={e} no es coprimo con φ(N)={phi_N}.")
-                
-                val_label.config(text="✓ Parámetros válidos.", style="Success.TLabel")
-                N = p * q
-                d = CriptoMath.modinv(e, phi_N)
-                rsa_params.update({'N': N, 'e': e, 'd': d})
-                
-                self._set_readonly_entry(pub_key_out, f"({N}, {e})")
-                self._set_readonly_entry(priv_key_out, str(d))
-                exec_btn.config(state='normal')
-
-            except Exception as ex:
-                val_label.config(text=f"Error: {ex}", style="Error.TLabel")
-                self._set_readonly_entry(pub_key_out, "")
-                self._set_readonly_entry(priv_key_out, "")
-                exec_btn.config(state='disabled')
-
-        gen_btn.config(command=validate_and_generate)
-        for entry in [p_in, q_in, e_in]:
-            entry.bind("<KeyRelease>", lambda e: validate_and_generate())
-
-        def execute():
-            try:
-                key = rsa_params['e'] if mode.get() == 'enc' else rsa_params['d']
-                res = CriptoMath.rsa_cipher(text_in.get("1.0", "end-1c"), rsa_params['N'], key, mode.get())
-                result_text.config(text=res['result']); self._update_tree(steps_tree, res['steps'])
-            except Exception as ex: messagebox.showerror("Error", str(ex))
-            
-        exec_btn.config(command=execute)
-        validate_and_generate()
-        
-    def _setup_euclides_ui(self, controls, output):
-        a_in = self._create_labeled_entry(controls, "Entero (a):", "391")
-        b_in = self._create_labeled_entry(controls, "Entero (b):", "299")
-        
-        _, result_text, steps_tree = self._common_widgets(controls, output, ["Paso de División", "Identidad de Bézout"], show_mode=False)
-        result_text.config(wraplength=350, justify='left')
-
-        def execute():
-            try:
-                res = CriptoMath.euclides_algorithm(int(a_in.get()), int(b_in.get()))
-                result_text.config(text=res['result']); self._update_tree(steps_tree, res['steps'])
-            except Exception as e: messagebox.showerror("Error", str(e))
-        
-        ttk.Button(controls, text="Calcular", command=execute).pack(fill='x', side='bottom', padx=20, pady=20)
-        
-    def _setup_inverso_ui(self, controls, output):
-        a_in = self._create_labeled_entry(controls, "Entero (a):", "17")
-        m_in = self._create_labeled_entry(controls, "Módulo (m):", "20")
-        val_label = ttk.Label(controls, font=self.font_small, style="Card.TLabel"); val_label.pack(anchor='w', padx=20)
-        
-        exec_btn = ttk.Button(controls, text="Calcular Inverso")
-
-        def validate(*args):
-            try:
-                a, m = int(a_in.get()), int(m_in.get())
-                if m <= 1: raise ValueError("Módulo debe ser > 1.")
-                g = CriptoMath.mcd(a,m)
-                if g == 1:
-                    val_label.config(text=f"✓ mcd({a},{m}) = 1. El inverso existe.", style="Success.TLabel")
-                    exec_btn.config(state="normal")
-                else:
-                    val_label.config(text=f"✖ mcd({a},{m}) = {g}. NO existe.", style="Error.TLabel")
-                    exec_btn.config(state="disabled")
-            except (ValueError, TypeError) as e:
-                val_label.config(text=f"Error: {e}", style="Error.TLabel")
-                exec_btn.config(state="disabled")
-
-        a_in.bind("<KeyRelease>", validate); m_in.bind("<KeyRelease>", validate)
-        
-        _, result_text, steps_tree = self._common_widgets(controls, output, ["Paso", "Cálculo", "Resultado"], show_mode=False)
-
-        def execute():
-            try:
-                a, m = int(a_in.get()), int(m_in.get())
-                inv = CriptoMath.modinv(a, m)
-                g, x, y = CriptoMath.egcd(a,m)
-                steps = [("Verificar", f"mcd({a},{m})", g), ("Euclides Ext.", f"{a}({x})+{m}({y})={g}", f"x={x}"), ("Inverso", f"x mod m", inv)]
-                result_text.config(text=f"{a}⁻¹ ≡ {inv} (mod {m})")
-                self._update_tree(steps_tree, steps)
-            except Exception as e: messagebox.showerror("Error", str(e))
-        
-        exec_btn.config(command=execute); exec_btn.pack(fill='x', side='bottom', padx=20, pady=20)
-        validate()
-        
-    def _setup_tcr_ui(self, controls, output):
-        ttk.Label(controls, text="Sistema de Congruencias:", style="Card.TLabel", font=self.font_bold).pack(anchor='w', padx=20)
-        
-        rows_frame = ttk.Frame(controls, style="Card.TFrame"); rows_frame.pack(fill='x', padx=20, pady=5)
-        val_label = ttk.Label(controls, font=self.font_small, style="Card.TLabel"); val_label.pack(anchor='w', padx=20)
-        tcr_rows = []
-
-        def validate_tcr():
-            try:
-                # CORRECCIÓN: Ahora se obtiene de la tupla correcta
-                moduli = [int(n.get()) for f, r, n in tcr_rows if n.get()]
-                if len(moduli) < 2:
-                    val_label.config(text="")
-                    return True
-                
-                for i in range(len(moduli)):
-                    if moduli[i] <= 1: raise ValueError(f"Módulo {moduli[i]} debe ser > 1.")
-                    for j in range(i + 1, len(moduli)):
-                        if CriptoMath.mcd(moduli[i], moduli[j]) != 1:
-                            raise ValueError(f"mcd({moduli[i]}, {moduli[j]}) ≠ 1")
-                val_label.config(text="✓ Módulos son coprimos en pares.", style="Success.TLabel")
-                return True
-            except Exception as e:
-                val_label.config(text=f"Error: {e}", style="Error.TLabel")
-                return False
-
-        def remove_row(row_tuple):
-            if len(tcr_rows) <= 2:
-                messagebox.showwarning("Aviso", "Se requieren al menos dos congruencias.")
-                return
-            frame, r_entry, n_entry = row_tuple
-            tcr_rows.remove(row_tuple)
-            frame.destroy()
-            validate_tcr()
-
-        def add_row(r_val="", n_val=""):
-            row_frame = ttk.Frame(rows_frame, style="Card.TFrame")
-            row_frame.pack(fill='x', pady=2)
-            
-            ttk.Label(row_frame, text="n ≡", style="Card.TLabel").pack(side='left', padx=2)
-            r = ttk.Entry(row_frame, width=5); r.pack(side='left'); r.insert(0, r_val)
-            ttk.Label(row_frame, text="(mod", style="Card.TLabel").pack(side='left', padx=2)
-            n = ttk.Entry(row_frame, width=5); n.pack(side='left'); n.insert(0, n_val)
-            ttk.Label(row_frame, text=")", style="Card.TLabel").pack(side='left', padx=2)
-            
-            # CORRECCIÓN: La tupla ahora incluye el frame para poder eliminarlo
-            row_tuple = (row_frame, r, n)
-            remove_btn = ttk.Button(row_frame, text="-", width=2, command=lambda t=row_tuple: remove_row(t))
-            remove_btn.pack(side='right', padx=(5,0))
-
-            r.bind("<KeyRelease>", lambda e: validate_tcr())
-            n.bind("<KeyRelease>", lambda e: validate_tcr())
-            
-            tcr_rows.append(row_tuple)
-            validate_tcr()
-            
-        ttk.Button(controls, text="Añadir Congruencia", command=lambda: add_row()).pack(fill='x', padx=20, pady=5)
-        add_row("2", "3"); add_row("3", "5"); add_row("2", "7")
-        
-        _, result_text, steps_tree = self._common_widgets(controls, output, ["Paso", "Cálculo", "Resultado"], show_mode=False)
-
-        def execute():
-            if not validate_tcr():
-                messagebox.showerror("Error de Validación", "Revise los módulos antes de continuar.")
-                return
-            try:
-                congruences = [(int(r.get()), int(n.get())) for f, r, n in tcr_rows]
-                res = CriptoMath.chinese_remainder_theorem(congruences)
-                result_text.config(text=res['result']); self._update_tree(steps_tree, res['steps'])
-            except Exception as e: messagebox.showerror("Error", str(e))
-
-        ttk.Button(controls, text="Resolver Sistema", command=execute).pack(fill='x', side='bottom', padx=20, pady=20)
-
+                try:
+                    row = next(self._source)
+                except StopIteration:
+                    return
+                self._rows.append(row)
+                yield row
+            i += 1
+
+    def nbytes(self):
+        # Filas ya generadas (y guardadas para repetirlas); crece mientras se recorre
+        return _rows_size(self._rows)
+
+def _rows_size(rows):
+    # Estimación de una lista de filas a partir del tamaño de la primera
+    if not rows: return 0
+    row = rows[0]
+    row_size = sys.getsizeof(row) + (sum(map(sys.getsizeof, row)) if isinstance(row, tuple) else 0)
+    return sys.getsizeof(rows) + len(rows) * row_size
+
+class ResultCache:
+    # Caché LRU de resultados de CriptoMath, con clave (operación, parámetros, entrada). Se
+    # limita por número de entradas y por tamaño estimado en bytes; las entradas grandes se
+    # identifican por su digest BLAKE2b en lugar de guardarse completas.
+    def __init__(self, max_entries=128, max_bytes=64 << 20, digest_min=4096):
+        self.max_entries, self.max_bytes, self.digest_min = max_entries, max_bytes, digest_min
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = self.hits = self.misses = self.evictions = 0
+
+    def key(self, op, params, data):
+        if isinstance(data, str):
+            raw = data.encode('utf-8', 'surrogatepass')
+        elif isinstance(data, (bytes, bytearray, memoryview)):
+            raw = bytes(data)
+        else:
+            raw = repr(data).encode('utf-8', 'surrogatepass')
+        if len(raw) >= self.digest_min:
+            raw = hashlib.blake2b(raw, digest_size=32).digest()
+        return (op, params, raw)
 
-    # --- Métodos de Ayuda para UI ---
+    @staticmethod
+    def _size(key, result):
+        # Estimación: cadenas del resultado más las filas de la traza si ya es una lista, sus
+        # textos y su columna de letras si es un StepRecords o las filas ya repetibles si es
+        # diferida. Cada texto se cuenta una vez aunque lo compartan el resultado y la traza.
+        size = sys.getsizeof(key[2]) + 200
+        if isinstance(result, dict):
+            texts = {}
+            for value in result.values():
+                if isinstance(value, (str, bytes)):
+                    texts[id(value)] = value
+                elif isinstance(value, StepRecords):
+                    size += value.nbytes()
+                    texts.update((id(t), t) for t in (value._inputs, value._outputs) if t is not None)
+                elif isinstance(value, _ReplayableSteps):
+                    size += value.nbytes()
+                elif isinstance(value, list):
+                    size += _rows_size(value)
+            size += sum(map(sys.getsizeof, texts.values()))
+        return size
+
+    def _remeasure(self):
+        # Las trazas diferidas guardan sus filas a medida que alguien las recorre: antes de
+        # cada consulta se vuelven a medir y se desaloja lo que exceda los límites
+        for key, (result, size) in list(self._entries.items()):
+            if isinstance(result, dict) and isinstance(result.get('steps'), _ReplayableSteps):
+                new_size = self._size(key, result)
+                self._entries[key] = (result, new_size)
+                self.bytes += new_size - size
+        self._evict()
+
+    def _evict(self):
+        while self._entries and (len(self._entries) > self.max_entries or self.bytes > self.max_bytes):
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.bytes -= evicted
+            self.evictions += 1
+
+    def get(self, key, data=None):
+        # data: la entrada de la operación, con la que se reconstruyen las trazas guardadas sin ella
+        with self._lock:
+            self._remeasure()
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        _count('cache_misses' if entry is None else 'cache_hits')
+        if entry is None:
+            return None
+        result = dict(entry[0])
+        steps = result.get('steps')
+        if isinstance(steps, StepRecords) and steps._inputs is None:
+            # Solo se guardan así trazas sobre texto; sin él (o con sus bytes) no se reconstruyen
+            result['steps'] = steps._with_inputs(data) if isinstance(data, str) else []
+        return result
+
+    def put(self, key, result, data=None):
+        if isinstance(result, dict) and result.get('steps') is not None and not isinstance(result['steps'], (list, StepRecords, _ReplayableSteps)):
+            result = dict(result, steps=_ReplayableSteps(result['steps']))
+        # Una traza que referencia la entrada se guarda sin ella: la caché identifica las entradas
+        # grandes por su digest y no debe retenerlas completas a través de la traza
+        stored = result
+        if data is not None and isinstance(result, dict) and isinstance(result.get('steps'), StepRecords) and result['steps']._inputs is data:
+            stored = dict(result, steps=result['steps']._with_inputs(None))
+        size = self._size(key, stored)
+        if size > self.max_bytes:
+            return result
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None: self.bytes -= old[1]
+            self._entries[key] = (stored, size)
+            self.bytes += size
+            self._remeasure()
+        return dict(result)
+
+    def call(self, op, params, data, compute):
+        # Devuelve el resultado guardado o ejecuta compute() y lo guarda. Las trazas diferidas
+        # se envuelven para que cada acierto pueda recorrerlas de nuevo.
+        key = self.key(op, params, data)
+        result = self.get(key, data)
+        if result is None:
+            result = self.put(key, compute(), data)
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        with self._lock:
+            self._remeasure()
+        return {'entries': len(self._entries), 'bytes': self.bytes, 'hits': self.hits,
+                'misses': self.misses, 'evictions': self.evictions}
 
-    def _common_widgets(self, controls, output, tree_cols, show_mode=True):
-        mode = tk.StringVar(value="enc")
-        if show_mode:
-            mode_frame = ttk.Frame(controls, style="Card.TFrame")
-            mode_frame.pack(anchor='w', padx=20, pady=10)
-            ttk.Radiobutton(mode_frame, text="Encriptar", variable=mode, value="enc").pack(side='left')
-            ttk.Radiobutton(mode_frame, text="Desencriptar", variable=mode, value="dec").pack(side='left', padx=10)
-        
-        ttk.Label(output, text="Resultado Final:", font=self.font_bold).pack(anchor='w', padx=10, pady=(0,5))
-        result_text = ttk.Label(output, text="-", style="Result.TLabel"); result_text.pack(anchor='w', padx=10, pady=(0,10))
-        ttk.Label(output, text="Proceso Matemático:", font=self.font_bold).pack(anchor='w', padx=10, pady=(10,5))
-        
-        tree_frame = ttk.Frame(output); tree_frame.pack(fill='both', expand=True, padx=10, pady=(0,10))
-        tree = self._create_treeview(tree_frame, tree_cols)
-        
-        return mode, result_text, tree
-
-    def _create_labeled_entry(self, parent, label_text, default_value, readonly=False):
-        frame = ttk.Frame(parent, style="Card.TFrame")
-        frame.pack(fill='x', padx=10, pady=2)
-        ttk.Label(frame, text=label_text, style="Card.TLabel", width=15).pack(side='left')
-        entry = ttk.Entry(frame, state='readonly' if readonly else 'normal')
-        entry.pack(side='left', fill='x', expand=True)
-        if default_value: entry.insert(0, default_value)
-        return entry
-        
-    def _set_readonly_entry(self, entry, value):
-        entry.config(state='normal')
-        entry.delete(0, tk.END)
-        entry.insert(0, value)
-        entry.config(state='readonly')
-
-    def _create_treeview(self, parent, columns):
-        parent.grid_rowconfigure(0, weight=1); parent.grid_columnconfigure(0, weight=1)
-        tree = ttk.Treeview(parent, columns=columns, show="headings")
-        for col in columns:
-            tree.heading(col, text=col)
-            tree.column(col, width=150, anchor='w')
-        
-        vsb = ttk.Scrollbar(parent, orient="vertical", command=tree.yview)
-        hsb = ttk.Scrollbar(parent, orient="horizontal", command=tree.xview)
-        tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
-        
-        tree.grid(row=0, column=0, sticky='nsew')
-        vsb.grid(row=0, column=1, sticky='ns')
-        hsb.grid(row=1, column=0, sticky='ew')
-        return tree
 
-    def _update_tree(self, tree, data):
-        tree.delete(*tree.get_children())
-        for row in data:
-            tree.insert("", tk.END, values=row)
+# =================================================================================================
+# SECCIÓN 2: INTERFAZ DE LÍNEA DE COMANDOS
+# La GUI vive en criptosuite_gui.py y tkinter solo se importa al lanzarla.
+# =================================================================================================
+def __getattr__(name):
+    # Compatibilidad: `from criptosuite import CriptoSuiteApp` sigue funcionando
+    if name == 'CriptoSuiteApp':
+        from criptosuite_gui import CriptoSuiteApp
+        return CriptoSuiteApp
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def _open_in(path):
+    if path in (None, '-'):
+        return sys.stdin
+    return open(path, encoding='utf-8', errors='surrogateescape', newline='')
+
+def _open_out(path):
+    if path in (None, '-'):
+        return sys.stdout
+    return open(path, 'w', encoding='utf-8', errors='surrogateescape', newline='')
+
+def _read_text(args):
+    if getattr(args, 'text', None) is not None:
+        return args.text
+    src = _open_in(args.input)
+    try:
+        return src.read()
+    finally:
+        if src is not sys.stdin: src.close()
+
+def _write_result(args, res):
+    dst = _open_out(args.output)
+    try:
+        dst.write(res['result'])
+        if dst is sys.stdout and not res['result'].endswith('\n'): dst.write('\n')
+    finally:
+        if dst is not sys.stdout: dst.close()
+    _write_steps(args, res)
+
+def _write_steps(args, res):
+    if getattr(args, 'steps', False):
+        for row in res['steps']:
+            print('\t'.join(map(str, row)), file=sys.stderr)
+
+def _exponent_arg(value):
+    try:
+        e = int(value)
+        CriptoMath._rsa_check_exponent(e)
+    except ValueError as ex:
+        raise argparse.ArgumentTypeError(str(ex))
+    return e
+
+def _positive_arg(value):
+    n = int(value)
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"{n} debe ser al menos 1.")
+    return n
+
+def _check_in_place(args):
+    if args.input in (None, '-') or args.output is not None or args.text is not None or args.steps:
+        raise ValueError("--in-place requiere -i ARCHIVO y no admite -t, -o ni --steps.")
+
+def _cli_classic(args):
+    key = {'caesar': lambda: args.b, 'affine': lambda: (args.a, args.b), 'vigenere': lambda: args.key}[args.command]()
+    if args.in_place:
+        _check_in_place(args)
+        CriptoMath.cipher_file_inplace(args.input, args.command, key, args.decrypt)
+        return
+    if args.steps or args.text is not None:
+        res = CriptoMath.run_cipher(_read_text(args), args.command, key, args.decrypt)
+        _write_result(args, res)
+        return
+    # Sin pasos, el texto se procesa por fragmentos con memoria acotada
+    src, dst = _open_in(args.input), _open_out(args.output)
+    try:
+        chunks = iter(lambda: src.read(CriptoMath.CHUNK_SIZE), '')
+        for chunk in CriptoMath.cipher_stream(chunks, args.command, key, args.decrypt):
+            dst.write(chunk)
+    finally:
+        if src is not sys.stdin: src.close()
+        if dst is not sys.stdout: dst.close()
+
+def _cli_vigenere_break(args):
+    res = CriptoMath.break_vigenere(_read_text(args), args.max_length, args.lang, args.candidates)
+    _write_result(args, res)
+    for c in res['candidates']:
+        print(f"{c['key']}\tlongitud={c['length']}\tevidencia={c['length_score']:.3f}\tchi2={c['score']:.4f}\tic={c['ic']:.4f}\tkasiski={c['kasiski']}", file=sys.stderr)
+
+def _cli_brute_force(args):
+    res = CriptoMath.brute_force(_read_text(args), args.cipher, args.top, args.lang)
+    _write_result(args, res)
+    for c in res['candidates']:
+        print(f"{c['key']}\tchi2={c['score']:.4f}\t{c['preview']!r}", file=sys.stderr)
+
+def _cli_batch(args):
+    if args.cipher == 'caesar':
+        if args.b is None: raise ValueError("César requiere -b.")
+        key = args.b
+    elif args.cipher == 'affine':
+        if args.a is None or args.b is None: raise ValueError("Afín requiere -a y -b.")
+        key = (args.a, args.b)
+    elif args.cipher == 'vigenere':
+        if args.key is None: raise ValueError("Vigenère requiere -k.")
+        key = args.key
+    elif not args.decrypt:
+        if args.N is None or args.e is None: raise ValueError("Para cifrar con RSA se requieren -N y -e.")
+        key = (args.N, args.e)
+    elif args.p is not None and args.q is not None and args.e is not None:
+        priv = RSAPrivateKey(args.p, args.q, args.e)
+        key = (priv.N, priv)
+    else:
+        if args.N is None or args.private is None: raise ValueError("Para descifrar con RSA se requieren -N y --private, o bien -p, -q y -e.")
+        key = (args.N, args.private)
+    CriptoMath.batch_file(args.input, args.output, args.cipher, key, args.decrypt, args.block, args.field, args.lines, args.format)
+
+def _cli_otp(args):
+    if args.in_place:
+        _check_in_place(args)
+        if args.key_file is None: raise ValueError("--in-place con OTP requiere --key-file.")
+        CriptoMath.cipher_file_inplace(args.input, 'otp', args.key_file, args.decrypt)
+        return
+    if args.key_file is None or args.steps or args.text is not None:
+        key_file = None if args.key is not None else args.key_file
+        _write_result(args, CriptoMath.one_time_pad_cipher(_read_text(args), args.key, args.decrypt, args.steps, key_file))
+        return
+    # Mensaje y llave en archivos: ambos se leen por fragmentos
+    src, dst = _open_in(args.input), _open_out(args.output)
+    try:
+        with open(args.key_file, encoding='ascii') as pad:
+            chunks = iter(lambda: src.read(CriptoMath.CHUNK_SIZE), '')
+            for chunk in CriptoMath.cipher_stream(chunks, 'otp', pad, args.decrypt):
+                dst.write(chunk)
+    finally:
+        if src is not sys.stdin: src.close()
+        if dst is not sys.stdout: dst.close()
+
+def _cli_otp_keygen(args):
+    length = args.length if args.length is not None else CriptoMath.count_file_letters(args.message)
+    if args.output in (None, '-'):
+        for chunk in CriptoMath._otp_key_chunks(length):
+            sys.stdout.write(chunk)
+        sys.stdout.write('\n')
+    else:
+        CriptoMath.generate_otp_key_file(args.output, length)
+
+def _cli_rsa(args):
+    if args.action == 'keygen':
+        priv = CriptoMath.generate_rsa_keypair(args.bits, 65537 if args.e is None else args.e)
+        print(f"p={priv.p}\nq={priv.q}\nN={priv.N}\ne={priv.e}\nd={priv.d}")
+        return
+    if args.action == 'enc':
+        if args.N is None or args.e is None: raise ValueError("Para cifrar se requieren -N y -e.")
+        N, key = args.N, args.e
+    elif args.p is not None and args.q is not None:
+        if args.e is None: raise ValueError("Con -p y -q se requiere también -e.")
+        key = RSAPrivateKey(args.p, args.q, args.e)
+        N = key.N
+    else:
+        if args.N is None or args.d is None: raise ValueError("Para descifrar se requieren -N y -d, o bien -p, -q y -e.")
+        N, key = args.N, args.d
+    if args.action == 'dec' and args.text is None:
+        # El contenedor binario se lee como bytes; cualquier otra entrada, como texto
+        src = sys.stdin.buffer if args.input in (None, '-') else open(args.input, 'rb')
+        try:
+            data = src.read()
+        finally:
+            if src is not sys.stdin.buffer: src.close()
+        text = data if data.startswith(CriptoMath.RSA_MAGIC) else data.decode('utf-8')
+    else:
+        text = _read_text(args)
+    res = CriptoMath.rsa_cipher(text, N, key, args.action, trace=args.steps, block=args.block, fmt=args.format)
+    if isinstance(res['result'], bytes):
+        dst = sys.stdout.buffer if args.output in (None, '-') else open(args.output, 'wb')
+        try:
+            dst.write(res['result'])
+        finally:
+            if dst is not sys.stdout.buffer: dst.close()
+        _write_steps(args, res)
+        return
+    _write_result(args, res)
+
+def _cli_gcd(args):
+    _write_result(args, CriptoMath.euclides_algorithm(args.a, args.b))
+
+def _cli_inv(args):
+    print(CriptoMath.modinv(args.a, args.m))
+
+def _cli_crt(args):
+    try:
+        congruences = [tuple(int(v) for v in item.split(':')) for item in args.congruences]
+    except ValueError:
+        raise ValueError("Cada congruencia debe tener la forma r:n (por ejemplo 2:3).")
+    _write_result(args, CriptoMath.chinese_remainder_theorem(congruences, trace=args.steps))
+
+def _build_parser():
+    parser = argparse.ArgumentParser(prog='criptosuite', description="CriptoSuite: cifrados clásicos, RSA y aritmética modular. Sin argumentos abre la GUI.")
+    parser.add_argument('--stats-log', metavar='ARCHIVO', help="añade una línea JSON por operación con tiempo y contadores ('-' = stderr)")
+    parser.add_argument('--profile', metavar='ARCHIVO', help="perfila la operación con cProfile: guarda el .prof, o '-' para un resumen en stderr")
+    sub = parser.add_subparsers(dest='command')
+    p = sub.add_parser('gui', help="abre la interfaz gráfica")
+    p.add_argument('--timing', action='store_true', help="muestra en stderr los tiempos de arranque de la ventana y de cada pestaña")
+
+    def io_args(p, text=True):
+        if text: p.add_argument('-t', '--text', help="texto de entrada (por defecto se lee de --input o stdin)")
+        p.add_argument('-i', '--input', help="archivo de entrada ('-' = stdin)")
+        p.add_argument('-o', '--output', help="archivo de salida ('-' = stdout)")
+        p.add_argument('--steps', action='store_true', help="escribe los pasos en stderr, separados por tabuladores")
+
+    def in_place_arg(p):
+        p.add_argument('--in-place', action='store_true', help="cifra el archivo de --input sobre sí mismo (mmap); solo cambian las letras ASCII")
+
+    p = sub.add_parser('caesar', help="cifrado César"); p.add_argument('-b', type=int, required=True)
+    p.add_argument('-d', '--decrypt', action='store_true'); io_args(p); in_place_arg(p)
+    p = sub.add_parser('affine', help="cifrado afín"); p.add_argument('-a', type=int, required=True); p.add_argument('-b', type=int, required=True)
+    p.add_argument('-d', '--decrypt', action='store_true'); io_args(p); in_place_arg(p)
+    p = sub.add_parser('vigenere', help="cifrado Vigenère"); p.add_argument('-k', '--key', required=True)
+    p.add_argument('-d', '--decrypt', action='store_true'); io_args(p); in_place_arg(p)
+    p = sub.add_parser('vigenere-break', help="criptoanálisis de Vigenère: recupera la llave sin conocerla")
+    p.add_argument('--max-length', type=int, default=20, help="longitud máxima de llave a probar")
+    p.add_argument('--lang', choices=sorted(CriptoMath.LETTER_FREQUENCIES), default='en', help="idioma del texto claro")
+    p.add_argument('--candidates', type=int, default=5, help="llaves candidatas que se listan en stderr")
+    io_args(p)
+    p = sub.add_parser('brute', help="fuerza bruta sobre César o Afín")
+    p.add_argument('cipher', choices=['caesar', 'affine'])
+    p.add_argument('--top', type=_positive_arg, default=5, help="llaves mejor puntuadas que se listan en stderr")
+    p.add_argument('--lang', choices=sorted(CriptoMath.LETTER_FREQUENCIES), default='en', help="idioma del texto claro")
+    io_args(p)
+    p = sub.add_parser('otp', help="one-time pad"); key = p.add_mutually_exclusive_group(required=True)
+    key.add_argument('-k', '--key'); key.add_argument('--key-file', help="archivo con la llave (se lee por fragmentos)")
+    p.add_argument('-d', '--decrypt', action='store_true'); io_args(p); in_place_arg(p)
+    p = sub.add_parser('otp-keygen', help="genera una llave OTP aleatoria segura"); size = p.add_mutually_exclusive_group(required=True)
+    size.add_argument('length', nargs='?', type=int, help="número de letras")
+    size.add_argument('--for', dest='message', help="archivo de mensaje: la llave tendrá tantas letras como él")
+    p.add_argument('-o', '--output', help="archivo de llave ('-' = stdout)")
+    p = sub.add_parser('rsa', help="cifrado RSA y generación de claves")
+    p.add_argument('action', choices=['enc', 'dec', 'keygen'])
+    p.add_argument('-N', type=int); p.add_argument('-e', type=_exponent_arg); p.add_argument('-d', type=int)
+    p.add_argument('-p', type=int); p.add_argument('-q', type=int)
+    p.add_argument('--bits', type=int, default=2048, help="tamaño de N para keygen")
+    p.add_argument('--block', action='store_true', help="cifra los bytes UTF-8 por bloques")
+    p.add_argument('--format', choices=CriptoMath.RSA_FORMATS, default='decimal',
+                   help="formato del texto cifrado al cifrar (al descifrar se detecta)")
+    io_args(p)
+    p = sub.add_parser('batch', help="procesa un archivo JSONL (o de líneas) de mensajes con una misma llave")
+    p.add_argument('cipher', choices=['caesar', 'affine', 'vigenere', 'rsa'])
+    p.add_argument('-i', '--input', required=True, help="archivo JSONL de entrada")
+    p.add_argument('-o', '--output', required=True, help="archivo JSONL de salida")
+    p.add_argument('-d', '--decrypt', action='store_true')
+    p.add_argument('-a', type=int); p.add_argument('-b', type=int); p.add_argument('-k', '--key')
+    p.add_argument('-N', type=int); p.add_argument('-e', type=_exponent_arg); p.add_argument('--private', type=int, help="exponente privado d (RSA)")
+    p.add_argument('-p', type=int); p.add_argument('-q', type=int)
+    p.add_argument('--block', action='store_true', help="RSA por bloques de bytes UTF-8")
+    p.add_argument('--field', default='text', help="campo de cada registro con el mensaje")
+    p.add_argument('--lines', action='store_true', help="cada línea es un mensaje en texto plano, no JSON")
+    p.add_argument('--format', choices=['decimal', 'base64'], default='decimal', help="formato del cifrado RSA")
+    p = sub.add_parser('bench', help="mide el rendimiento de CriptoMath y lo compara con una ejecución anterior")
+    p.add_argument('--ops', nargs='+', metavar='OP', help="operaciones a medir (por defecto todas)")
+    p.add_argument('--quick', action='store_true', help="omite los tamaños más grandes")
+    p.add_argument('--repeat', type=int, default=3, help="mediciones por caso (se conserva la mejor)")
+    p.add_argument('-o', '--output', help="guarda los resultados como JSON")
+    p.add_argument('--compare', metavar='BASELINE', help="JSON de una ejecución anterior con el que comparar")
+    p.add_argument('--threshold', type=float, default=0.10, help="aumento relativo a partir del cual se marca una regresión")
+    p = sub.add_parser('gcd', help="algoritmo de Euclides extendido"); p.add_argument('a', type=int); p.add_argument('b', type=int)
+    p.add_argument('-o', '--output'); p.add_argument('--steps', action='store_true')
+    p = sub.add_parser('inv', help="inverso modular"); p.add_argument('a', type=int); p.add_argument('m', type=int)
+    p = sub.add_parser('crt', help="teorema chino del residuo"); p.add_argument('congruences', nargs='+', metavar='r:n')
+    p.add_argument('-o', '--output'); p.add_argument('--steps', action='store_true')
+    return parser
+
+_COMMANDS = {'caesar': _cli_classic, 'affine': _cli_classic, 'vigenere': _cli_classic, 'otp': _cli_otp,
+             'otp-keygen': _cli_otp_keygen, 'vigenere-break': _cli_vigenere_break, 'brute': _cli_brute_force,
+             'batch': _cli_batch, 'rsa': _cli_rsa, 'gcd': _cli_gcd, 'inv': _cli_inv, 'crt': _cli_crt}
+
+def main(argv=None):
+    args = _build_parser().parse_args(argv)
+    if args.command in (None, 'gui'):
+        from criptosuite_gui import main as gui_main
+        gui_main(getattr(args, 'timing', False))
+        return 0
+    log = None
+    try:
+        if args.command == 'bench':
+            from criptosuite_bench import main as bench_main
+            return bench_main(args)
+        if args.stats_log is None and args.profile is None:
+            _COMMANDS[args.command](args)
+            return 0
+        log = sys.stderr if args.stats_log == '-' else open(args.stats_log, 'a', encoding='utf-8') if args.stats_log else None
+        try:
+            _, record = instrument(args.command, _COMMANDS[args.command], args, profile=args.profile is not None, log=log)
+        finally:
+            if log not in (None, sys.stderr): log.close()
+        if args.profile == '-':
+            print(profile_report(record), file=sys.stderr)
+        elif args.profile:
+            record['profile'].dump_stats(args.profile)
+    except (ValueError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
 
 if __name__ == "__main__":
-    app = CriptoSuiteApp()
-    app.mainloop()
-
+    sys.exit(main())
@@ -0,0 +1,194 @@
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from criptosuite import CriptoMath, _numpy, _primes_below
+
+# =================================================================================================
+# SECCIÓN 3: BANCO DE PRUEBAS DE RENDIMIENTO
+# Cada operación de CriptoMath se mide sobre tamaños crecientes, con y sin traza de pasos.
+# Los resultados se guardan como JSON y se comparan con una ejecución anterior.
+# =================================================================================================
+TEXT_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+# Con traza se genera una fila por carácter: tamaños mayores solo miden la lista de pasos
+TRACE_MAX_SIZE = 100_000
+KEY_BITS = (512, 1024, 2048)
+INT_BITS = (64, 1024, 4096, 16384)
+PRIME_BITS = (64, 512, 1024, 2048)
+CRT_SIZES = (10, 100, 1000)
+# Tiempo mínimo por medición: las operaciones rápidas se repiten hasta alcanzarlo
+MIN_TIME = 0.2
+SEED = 1234
+
+def _text(size, rng):
+    words = ["the", "quick", "brown", "fox", "jumps", "over", "lazy", "dog", "cifrado", "llave", "mensaje"]
+    parts, length = [], 0
+    while length < size:
+        word = rng.choice(words)
+        word = word.upper() if rng.random() < 0.3 else word
+        parts.append(word); length += len(word) + 1
+    return ' '.join(parts)[:size]
+
+def _consume(res):
+    # Con trace='lazy' o listas, recorrer los pasos para medir su costo real
+    steps = res.get('steps') if isinstance(res, dict) else None
+    if steps is not None and not isinstance(steps, list):
+        for _ in steps: pass
+    return res
+
+def _cipher_cases(rng, sizes):
+    for size in sizes:
+        text = _text(size, rng)
+        pad = CriptoMath.generate_otp_key(CriptoMath._count_letters(text))
+        ops = {
+            'caesar': lambda trace, t=text: CriptoMath.caesar_cipher(t, 3, trace=trace),
+            'affine': lambda trace, t=text: CriptoMath.affine_cipher(t, 5, 8, trace=trace),
+            'vigenere': lambda trace, t=text: CriptoMath.vigenere_cipher(t, "LEMON", trace=trace),
+            'otp': lambda trace, t=text, k=pad: CriptoMath.one_time_pad_cipher(t, k, trace=trace),
+        }
+        for op, func in ops.items():
+            for trace in (False, True):
+                if trace and size > TRACE_MAX_SIZE: continue
+                yield op, size, trace, 'chars', size, func
+
+def _rsa_cases(rng, bits_list):
+    for bits in bits_list:
+        # La generación de la clave queda fuera de la medición
+        priv = CriptoMath.generate_rsa_keypair(bits)
+        message = _text(1024, rng)
+        n_bytes = len(message.encode('utf-8'))
+        cipher = CriptoMath.rsa_cipher(message, priv.N, priv.e, 'enc', trace=False, block=True)['result']
+        ops = {
+            'rsa_enc': lambda trace, m=message, k=priv: CriptoMath.rsa_cipher(m, k.N, k.e, 'enc', trace=trace, block=True),
+            'rsa_dec': lambda trace, c=cipher, k=priv: CriptoMath.rsa_cipher(c, k.N, k.d, 'dec', trace=trace, block=True),
+            'rsa_dec_crt': lambda trace, c=cipher, k=priv: CriptoMath.rsa_cipher(c, k.N, k, 'dec', trace=trace, block=True),
+        }
+        for op, func in ops.items():
+            for trace in (False, True):
+                yield op, bits, trace, 'bytes', n_bytes, func
+
+def _int_cases(rng, bits_list):
+    for bits in bits_list:
+        pairs = [(rng.getrandbits(bits) | 1, rng.getrandbits(bits) | (1 << (bits - 1))) for _ in range(20)]
+        modulus = CriptoMath.generate_prime(bits) if bits <= 2048 else (1 << bits) - 1
+        values = [v for v in (rng.randrange(1, modulus) for _ in range(20)) if CriptoMath.mcd(v, modulus) == 1]
+        yield 'egcd', bits, False, 'ops', len(pairs), lambda trace, p=pairs: [CriptoMath.egcd(a, b) for a, b in p]
+        yield 'modinv', bits, False, 'ops', len(values), lambda trace, v=values, m=modulus: [CriptoMath.modinv(x, m) for x in v]
+        yield 'batch_modinv', bits, False, 'ops', len(values), lambda trace, v=values, m=modulus: CriptoMath.batch_modinv(v, m)
+        if bits <= 1024:
+            # euclides_algorithm siempre construye sus pasos
+            yield 'euclides_algorithm', bits, True, 'ops', len(pairs), lambda trace, p=pairs: [CriptoMath.euclides_algorithm(a, b) for a, b in p]
+
+def _crt_cases(rng, sizes):
+    primes = _primes_below(20000)[1:]
+    for size in sizes:
+        congruences = [(rng.randrange(p), p) for p in primes[:size]]
+        for trace in (False, True):
+            yield 'crt', size, trace, 'congruencias', size, lambda trace, c=congruences: CriptoMath.chinese_remainder_theorem(c, trace=trace)
+
+def _prime_cases(rng, bits_list):
+    for bits in bits_list:
+        primes = [CriptoMath.generate_prime(bits) for _ in range(3)]
+        numbers = primes + [p * q for p, q in zip(primes, primes[1:])]
+        yield 'is_prime', bits, False, 'ops', len(numbers), lambda trace, n=numbers: [CriptoMath.is_prime(x) for x in n]
+
+# Operaciones de cada grupo de casos, para no preparar claves ni primos que no se van a medir
+_GROUPS = (
+    (('caesar', 'affine', 'vigenere', 'otp'), _cipher_cases, TEXT_SIZES, 3),
+    (('rsa_enc', 'rsa_dec', 'rsa_dec_crt'), _rsa_cases, KEY_BITS, 2),
+    (('egcd', 'modinv', 'batch_modinv', 'euclides_algorithm'), _int_cases, INT_BITS, 3),
+    (('crt',), _crt_cases, CRT_SIZES, 2),
+    (('is_prime',), _prime_cases, PRIME_BITS, 3),
+)
+OPERATIONS = tuple(op for group in _GROUPS for op in group[0])
+
+def _cases(ops, quick):
+    rng = random.Random(SEED)
+    for group_ops, cases, sizes, quick_count in _GROUPS:
+        if ops and not set(ops) & set(group_ops): continue
+        for case in cases(rng, sizes[:quick_count] if quick else sizes):
+            if not ops or case[0] in ops:
+                yield case
+
+def _measure(func, trace, repeat):
+    # Mejor de `repeat` mediciones; cada una repite la llamada hasta superar MIN_TIME
+    best = None
+    for _ in range(repeat):
+        calls, start = 0, time.perf_counter()
+        while True:
+            _consume(func(trace)); calls += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= MIN_TIME: break
+        per_call = elapsed / calls
+        best = per_call if best is None else min(best, per_call)
+    # Memoria pico en una llamada aparte: tracemalloc ralentiza la ejecución
+    tracemalloc.start()
+    try:
+        _consume(func(trace))
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+def run_benchmarks(ops=None, quick=False, repeat=3, progress=None):
+    unknown = set(ops or ()) - set(OPERATIONS)
+    if unknown:
+        raise ValueError(f"Operaciones desconocidas: {', '.join(sorted(unknown))}. Opciones: {', '.join(OPERATIONS)}.")
+    results = {}
+    for op, size, trace, unit, units, func in _cases(ops, quick):
+        seconds, peak = _measure(func, trace, repeat)
+        name = f"{op}|size={size}|trace={int(trace)}"
+        results[name] = {'op': op, 'size': size, 'trace': trace, 'seconds': seconds,
+                         'throughput': units / seconds, 'unit': f"{unit}/s", 'peak_bytes': peak}
+        if progress: progress(name, results[name])
+    np = _numpy()
+    meta = {'python': platform.python_version(), 'numpy': np.__version__ if np else None,
+            'platform': platform.platform(), 'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'), 'quick': quick}
+    return {'meta': meta, 'results': results}
+
+def save(report, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+
+def load(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def compare(baseline, current, threshold=0.10):
+    # Una medición es regresión si su tiempo o su memoria pico crecen más que threshold
+    rows = []
+    for name, new in current['results'].items():
+        old = baseline['results'].get(name)
+        if old is None: continue
+        time_ratio = new['seconds'] / old['seconds']
+        mem_ratio = new['peak_bytes'] / old['peak_bytes'] if old['peak_bytes'] else 1.0
+        rows.append({'name': name, 'time_ratio': time_ratio, 'mem_ratio': mem_ratio,
+                     'regression': time_ratio > 1 + threshold or mem_ratio > 1 + threshold})
+    return rows
+
+def format_result(name, r):
+    return f"{name:<42} {r['seconds'] * 1000:11.3f} ms {r['throughput']:14,.0f} {r['unit']:<16} {r['peak_bytes'] / 1024:10,.1f} KiB"
+
+def format_comparison(rows):
+    lines = []
+    for row in rows:
+        flag = "REGRESIÓN" if row['regression'] else ""
+        lines.append(f"{row['name']:<42} tiempo x{row['time_ratio']:.2f}  memoria x{row['mem_ratio']:.2f}  {flag}")
+    return '\n'.join(lines)
+
+def main(args):
+    report = run_benchmarks(args.ops, args.quick, args.repeat,
+                            progress=lambda name, r: print(format_result(name, r), file=sys.stderr))
+    if args.output:
+        save(report, args.output)
+    if args.compare:
+        rows = compare(load(args.compare), report, args.threshold)
+        print(format_comparison(rows))
+        regressions = [row['name'] for row in rows if row['regression']]
+        if regressions:
+            print(f"{len(regressions)} regresiones por encima del {args.threshold:.0%}.", file=sys.stderr)
+            return 1
+    return 0
@@ -0,0 +1,993 @@
+import itertools
+import os
+import sys
+import threading
+import time
+import tkinter as tk
+from tkinter import ttk, font, messagebox, filedialog
+
+from criptosuite import CriptoMath, RSAPrivateKey, ResultCache, format_stats, instrument, profile_report
+
+# =================================================================================================
+# SECCIÓN 2: APLICACIÓN PRINCIPAL (GUI con TKINTER)
+# =================================================================================================
+class JobCancelled(Exception):
+    pass
+
+class Job:
+    # Estado compartido entre el hilo de trabajo y el hilo de Tk
+    def __init__(self):
+        self.cancelled = threading.Event()
+        self.progress = None
+        self.done = False
+        self.result = self.error = self.record = None
+
+    def report(self, done, total):
+        # Callback de progreso para CriptoMath; también es el punto de cancelación cooperativa
+        if self.cancelled.is_set(): raise JobCancelled()
+        self.progress = done / total if total else 1.0
+
+class JobRunner:
+    # Ejecuta operaciones en un hilo de trabajo y entrega el resultado en el hilo de Tk,
+    # sondeando con after(). Enviar un trabajo nuevo cancela y reemplaza al pendiente.
+    POLL_MS = 50
+
+    def __init__(self, app, exec_btn, progress_bar, cancel_btn, on_idle=None, name=None, status=None, profile=None):
+        self.app, self.exec_btn = app, exec_btn
+        self.progress_bar, self.cancel_btn = progress_bar, cancel_btn
+        self.on_idle = on_idle
+        # Instrumentación: etiqueta de estado y BooleanVar que activa cProfile en la próxima ejecución
+        self.name, self.status, self.profile = name, status, profile
+        self.job = None
+
+    def submit(self, work, on_done):
+        self.cancel()
+        job = self.job = Job()
+        self.exec_btn.config(state='disabled'); self.cancel_btn.config(state='normal')
+        self.progress_bar.config(mode='indeterminate'); self.progress_bar.start(10)
+        if self.status is not None: self.status.config(text="Ejecutando...")
+        profile = bool(self.profile is not None and self.profile.get())
+        threading.Thread(target=self._run, args=(job, work, self.name, profile), daemon=True).start()
+        self.app.after(self.POLL_MS, self._poll, job, on_done)
+
+    @staticmethod
+    def _run(job, work, name, profile):
+        try:
+            job.result, job.record = instrument(name, work, job, profile=profile)
+        except Exception as e:
+            job.error = e
+        finally:
+            job.done = True
+
+    def _poll(self, job, on_done):
+        if job is not self.job:
+            return # cancelado o reemplazado
+        if job.progress is not None:
+            if str(self.progress_bar.cget('mode')) == 'indeterminate':
+                self.progress_bar.stop(); self.progress_bar.config(mode='determinate')
+            self.progress_bar.config(value=job.progress * 100)
+        if not job.done:
+            self.app.after(self.POLL_MS, self._poll, job, on_done)
+            return
+        self.job = None
+        self._idle()
+        if isinstance(job.error, JobCancelled):
+            if self.status is not None: self.status.config(text="Cancelado")
+            return
+        if job.error is not None:
+            if self.status is not None: self.status.config(text=f"Error: {job.error}")
+            messagebox.showerror("Error", str(job.error))
+            return
+        on_done(job.result)
+        if self.status is not None: self.status.config(text=format_stats(job.record))
+        if 'profile' in job.record: self.app._show_profile(self.name, profile_report(job.record))
+
+    def cancel(self):
+        if self.job is not None:
+            self.job.cancelled.set()
+            self.job = None
+            self._idle()
+
+    def _idle(self):
+        self.progress_bar.stop(); self.progress_bar.config(mode='determinate', value=0)
+        self.cancel_btn.config(state='disabled')
+        if self.on_idle: self.on_idle()
+        else: self.exec_btn.config(state='normal')
+
+class Debouncer:
+    # Agrupa ráfagas de eventos (p. ej. pulsaciones de teclas): la función solo se ejecuta
+    # cuando pasan `delay_ms` milisegundos sin una nueva llamada.
+    def __init__(self, widget, delay_ms, func):
+        self.widget, self.delay_ms, self.func = widget, delay_ms, func
+        self._pending = None
+
+    def __call__(self, *args):
+        if self._pending is not None:
+            self.widget.after_cancel(self._pending)
+        self._pending = self.widget.after(self.delay_ms, self._fire)
+
+    def _fire(self):
+        self._pending = None
+        self.func()
+
+class TextLetterCounter:
+    # Mantiene el número de letras (isalpha) de un tk.Text de forma incremental: intercepta
+    # los comandos insert/delete/replace del widget y solo examina el texto que cambia.
+    def __init__(self, text_widget):
+        self.widget = text_widget
+        self.count = CriptoMath._count_letters(text_widget.get("1.0", "end-1c"))
+        self._orig = text_widget._w + "_orig"
+        text_widget.tk.call("rename", text_widget._w, self._orig)
+        text_widget.tk.createcommand(text_widget._w, self._proxy)
+
+    @staticmethod
+    def _letters(text):
+        return sum(map(str.isalpha, text))
+
+    def _get(self, *indices):
+        return self.widget.tk.call(self._orig, 'get', *indices)
+
+    def _proxy(self, cmd, *args):
+        delta = 0
+        if cmd == 'insert' and len(args) > 1:
+            delta = sum(self._letters(chars) for chars in args[1::2])
+        elif cmd == 'delete' and args:
+            if len(args) == 1:
+                delta = -self._letters(self._get(args[0]))
+            else:
+                delta = -sum(self._letters(self._get(*args[i:i + 2])) for i in range(0, len(args) - 1, 2))
+        elif cmd == 'replace' and len(args) > 2:
+            delta = sum(self._letters(chars) for chars in args[2::2]) - self._letters(self._get(args[0], args[1]))
+        result = self.widget.tk.call((self._orig, cmd) + args)
+        self.count += delta
+        return result
+
+class StepView:
+    # Tabla de pasos virtualizada: las filas viven en un almacén (lista, secuencia o
+    # iterable perezoso que se consume bajo demanda) y el Treeview solo materializa la
+    # página visible. Al desplazarse más allá del borde de la página se carga la siguiente.
+    PAGE_SIZE = 200
+
+    def __init__(self, parent, columns):
+        parent.grid_rowconfigure(0, weight=1); parent.grid_columnconfigure(0, weight=1)
+        self.tree = ttk.Treeview(parent, columns=columns, show="headings")
+        for col in columns:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=150, anchor='w')
+
+        vsb = ttk.Scrollbar(parent, orient="vertical", command=self.tree.yview)
+        hsb = ttk.Scrollbar(parent, orient="horizontal", command=self.tree.xview)
+        self.tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
+
+        self.tree.grid(row=0, column=0, sticky='nsew')
+        vsb.grid(row=0, column=1, sticky='ns')
+        hsb.grid(row=1, column=0, sticky='ew')
+
+        nav = ttk.Frame(parent); nav.grid(row=2, column=0, columnspan=2, sticky='ew', pady=(5,0))
+        ttk.Button(nav, text="◀", width=3, command=lambda: self.show(self.start - self.PAGE_SIZE)).pack(side='left')
+        ttk.Button(nav, text="▶", width=3, command=lambda: self.show(self.start + self.PAGE_SIZE)).pack(side='left', padx=(2,10))
+        ttk.Label(nav, text="Ir a fila:").pack(side='left')
+        self.jump_in = ttk.Entry(nav, width=8); self.jump_in.pack(side='left', padx=5)
+        self.jump_in.bind("<Return>", self._jump)
+        self.count_label = ttk.Label(nav, text=""); self.count_label.pack(side='right')
+
+        for seq in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.tree.bind(seq, self._on_wheel, add='+')
+        self.set_data([])
+
+    def set_data(self, data):
+        if hasattr(data, '__getitem__') and hasattr(data, '__len__'):
+            self.rows, self.pending = data, None
+        else:
+            self.rows, self.pending = [], iter(data)
+        self.show(0)
+
+    def _fill(self, count):
+        # Consume el iterable perezoso hasta tener al menos `count` filas (o agotarlo)
+        while self.pending is not None and len(self.rows) < count:
+            chunk = list(itertools.islice(self.pending, max(count - len(self.rows), self.PAGE_SIZE)))
+            self.rows.extend(chunk)
+            if not chunk: self.pending = None
+
+    def show(self, start):
+        self._fill(start + self.PAGE_SIZE)
+        last_page = max(len(self.rows) - 1, 0) // self.PAGE_SIZE * self.PAGE_SIZE
+        self.start = min(max(start, 0), last_page)
+        self.tree.delete(*self.tree.get_children())
+        for row in self.rows[self.start:self.start + self.PAGE_SIZE]:
+            self.tree.insert("", tk.END, values=row)
+        end = min(self.start + self.PAGE_SIZE, len(self.rows))
+        total = f"{len(self.rows)}" if self.pending is None else f"más de {len(self.rows)}"
+        self.count_label.config(text=f"Filas {self.start + 1 if end else 0}–{end} de {total}")
+
+    def _jump(self, event=None):
+        try:
+            row = int(self.jump_in.get()) - 1
+        except ValueError:
+            return
+        self._fill(row + 1)
+        self.show(row // self.PAGE_SIZE * self.PAGE_SIZE)
+        index = row - self.start
+        children = self.tree.get_children()
+        if 0 <= index < len(children):
+            self.tree.see(children[index]); self.tree.selection_set(children[index])
+
+    def _on_wheel(self, event):
+        down = event.num == 5 or event.delta < 0
+        first, last = self.tree.yview()
+        if down and last >= 1.0 and self.start + self.PAGE_SIZE < len(self.rows) + (self.pending is not None):
+            self.show(self.start + self.PAGE_SIZE); self.tree.yview_moveto(0)
+            return "break"
+        if not down and first <= 0.0 and self.start > 0:
+            self.show(self.start - self.PAGE_SIZE); self.tree.yview_moveto(1)
+            return "break"
+
+class CriptoSuiteApp(tk.Tk):
+    # Caracteres del resultado que se muestran antes de truncar
+    RESULT_PREVIEW = 2000
+    # Espera tras la última pulsación antes de revalidar los campos de llave
+    VALIDATION_DELAY_MS = 300
+    # Límites de la caché de resultados (entradas y bytes estimados)
+    CACHE_ENTRIES = 64
+    CACHE_BYTES = 128 << 20
+
+    def __init__(self, timing_report=False):
+        self._start_time = time.perf_counter()
+        self._timing_report = timing_report
+        self.timings = []
+        self._ready = False
+        super().__init__()
+        self._mark("ventana Tk", self._start_time)
+        self._full_results = {}
+        # Resultados recientes: repetir una operación con la misma entrada no la recalcula
+        self.result_cache = ResultCache(self.CACHE_ENTRIES, self.CACHE_BYTES)
+        self.title("CriptoSuite Profesional (Python Edition)")
+        self.geometry("1200x750")
+        self.minsize(1000, 600)
+
+        # --- Estilo y Fuentes ---
+        self.style = ttk.Style(self)
+        try:
+            # Intenta usar un tema moderno si está disponible
+            from sv_ttk import set_theme
+            set_theme("light")
+        except ImportError:
+            self.style.theme_use('clam')
+
+        self.font_normal = font.nametofont("TkDefaultFont")
+        self.font_bold = self.font_normal.copy(); self.font_bold.configure(weight="bold")
+        self.font_title = self.font_normal.copy(); self.font_title.configure(size=16, weight="bold")
+        self.font_result = font.Font(family="Consolas", size=14, weight="bold")
+        self.font_small = self.font_normal.copy(); self.font_small.configure(size=9)
+        
+        self.configure(bg="#f3f4f6")
+        self.style.configure("TFrame", background="#f3f4f6")
+        self.style.configure("Card.TFrame", background="white", relief="solid", borderwidth=1, bordercolor="#d1d5db")
+        self.style.configure("TLabel", background="#f3f4f6")
+        self.style.configure("Card.TLabel", background="white")
+        self.style.configure("Header.TLabel", font=self.font_title, foreground="#007aff", background="white")
+        self.style.configure("Result.TLabel", font=self.font_result, background="#f3f4f6")
+        self.style.configure("Success.TLabel", foreground="#10b981", background="white")
+        self.style.configure("Error.TLabel", foreground="#ef4444", background="white")
+        self.style.configure("Treeview", rowheight=28, fieldbackground="white")
+        self.style.configure("Treeview.Heading", font=self.font_bold)
+        self.style.configure("TNotebook", borderwidth=0)
+        self.style.layout("TNotebook.Tab", []) # Ocultar tabs
+
+        start = time.perf_counter()
+        self._create_layout()
+        self._mark("layout y primera pestaña", start)
+        self.after_idle(self._window_ready)
+
+    def _create_layout(self):
+        # Layout principal (Sidebar + Contenido)
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(1, weight=1)
+
+        # --- Sidebar de Navegación ---
+        sidebar = ttk.Frame(self, width=250, style="Card.TFrame")
+        sidebar.grid(row=0, column=0, sticky="ns", padx=(10,0), pady=10)
+        sidebar.grid_propagate(False)
+        
+        ttk.Label(sidebar, text="CriptoSuite", style="Header.TLabel").pack(pady=20, padx=20, anchor='w')
+
+        self.nav_buttons = {}
+        self._pending_tabs = {}
+        self.notebook = ttk.Notebook(self, style="TNotebook")
+        self.notebook.grid(row=0, column=1, sticky="nsew", padx=10, pady=10)
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_change)
+
+        # Definición de herramientas
+        tools = [
+            ("Cifrado César", self._setup_cesar_ui),
+            ("Cifrado Afín", self._setup_afin_ui),
+            ("Euclides y MCD", self._setup_euclides_ui),
+            ("Inverso Modular", self._setup_inverso_ui),
+            ("T. Chino Residuo", self._setup_tcr_ui),
+            None, # Separador
+            ("C. Vigenère", self._setup_vigenere_ui),
+            ("Romper Vigenère", self._setup_vigenere_break_ui),
+            ("Fuerza Bruta", self._setup_brute_force_ui),
+            ("One-Time Pad", self._setup_otp_ui),
+            ("Criptosistema RSA", self._setup_rsa_ui)
+        ]
+
+        # Mapeo de índices de notebook a índices de botones (saltando el separador)
+        self.button_map = {i if i < 5 else i-1: i for i in range(len(tools))}
+
+        for i, tool_info in enumerate(tools):
+            if tool_info is None:
+                ttk.Separator(sidebar).pack(fill='x', padx=20, pady=10)
+                continue
+            
+            name, setup_func = tool_info
+            
+            # Crear botón de navegación
+            btn_index = i if i < 5 else i -1 # Ajustar índice por el separador
+            btn = ttk.Button(sidebar, text=name, command=lambda index=len(self.notebook.tabs()): self.notebook.select(index))
+            btn.pack(fill='x', padx=20, pady=2)
+            self.nav_buttons[btn_index] = btn
+            
+            # Solo se crea el marco vacío; los controles se construyen al abrir la pestaña
+            tool_frame = ttk.Frame(self.notebook)
+            self.notebook.add(tool_frame, text=name)
+            self._pending_tabs[btn_index] = (tool_frame, name, setup_func)
+            
+        self._on_tab_change() # Construir la primera pestaña y seleccionar su botón
+
+    def _build_tab(self, index):
+        tool_frame, name, setup_func = self._pending_tabs.pop(index)
+        self._building_tab = name
+        start = time.perf_counter()
+        # poblar la pestaña con sus controles y salidas
+        controls, output = self._create_base_panels(tool_frame)
+        ttk.Label(controls, text=name, style="Header.TLabel").pack(pady=(0, 20), padx=20, anchor='w')
+        setup_func(controls, output)
+        self._mark(f"pestaña '{name}'", start)
+
+    def _on_tab_change(self, event=None):
+        current_index = self.notebook.index(self.notebook.select())
+        if current_index in self._pending_tabs:
+            self._build_tab(current_index)
+        for index, button in self.nav_buttons.items():
+            button.state(["pressed"] if index == current_index else ["!pressed"])
+
+    # --- Informe de tiempos de arranque ---
+
+    def _mark(self, label, start):
+        self.timings.append((label, time.perf_counter() - start))
+        # Las pestañas abiertas después del arranque se informan al construirse
+        if self._timing_report and self._ready:
+            self.report_timings(self.timings[-1:])
+
+    def _window_ready(self):
+        self._mark("ventana lista (total)", self._start_time)
+        self._ready = True
+        if self._timing_report:
+            self.report_timings()
+
+    def report_timings(self, timings=None, file=None):
+        for label, seconds in self.timings if timings is None else timings:
+            print(f"{seconds * 1000:9.1f} ms  {label}", file=file or sys.stderr)
+
+    def _create_base_panels(self, parent):
+        parent.grid_columnconfigure(1, weight=1)
+        parent.grid_rowconfigure(0, weight=1)
+        
+        controls = ttk.Frame(parent, style="Card.TFrame", width=380)
+        controls.grid(row=0, column=0, sticky="ns", pady=10, padx=(10,5))
+        controls.pack_propagate(False)
+
+        output = ttk.Frame(parent, style="TFrame")
+        output.grid(row=0, column=1, sticky="nsew", pady=10, padx=(5,10))
+        output.grid_rowconfigure(2, weight=1)
+        output.grid_columnconfigure(0, weight=1)
+        
+        return controls, output
+
+    # --- Constructores de UI para cada Herramienta ---
+
+    def _setup_cesar_ui(self, controls, output):
+        ttk.Label(controls, text="Texto:", style="Card.TLabel", font=self.font_bold).pack(anchor='w', padx=20)
+        text_in = tk.Text(controls, height=5, font=self.font_normal, relief='solid', borderwidth=1, highlightthickness=1)
+        text_in.pack(fill='x', padx=20, pady=5)
+        text_in.insert("1.0", "HELLO WORLD")
+        
+        ttk.Label(controls, text="Shift (b):", style="Card.TLabel", font=self.font_bold).pack(anchor='w', padx=20, pady=(10,0))
+        b_in = ttk.Entry(controls); b_in.pack(fill='x', padx=20, pady=5); b_in.insert(0, "3")
+
+        mode, result_text, steps_tree = self._common_widgets(controls, output, ["Entrada", "Cálculo", "Salida"])
+
+        def execute():
+            try:
+                b_val = int(b_in.get())
+                if b_val < 0:
+                    raise ValueError("El shift 'b' no puede ser negativo.")
+            except ValueError as e: 
+                messagebox.showerror("Error de Entrada", f"Valor inválido para 'b'.\n{e}")
+                return
+            text, decrypt = text_in.get("1.0", "end-1c"), mode.get()=='dec'
+            runner.submit(lambda job: self.result_cache.call('caesar', (b_val, decrypt), text,
+                                                             lambda: CriptoMath.run_cipher(text, 'caesar', b_val, decrypt, trace='lazy', progress=job.report)),
+                          self._output_callback(result_text, steps_tree))
+            
+        exec_btn = ttk.Button(controls, text="Ejecutar", command=execute)
+        exec_btn.pack(fill='x', side='bottom', padx=20, pady=20)
+        runner = self._create_job_runner(controls, exec_btn)
+        self._add_file_button(controls, mode, 'caesar', lambda: int(b_in.get()), runner)
+
+    def _setup_afin_ui(self, controls, output):
+        ttk.Label(controls, text="Texto:", style="Card.TLabel", font=self.font_bold).pack(anchor='w', padx=20)
+        text_in = tk.Text(controls, height=5, font=self.font_normal, relief='solid', borderwidth=1, highlightthickness=1)
+        text_in.pack(fill='x', padx=20, pady=5); text_in.insert("1.0", "AFFINE CIPHER")
+        
+        ttk.Label(controls, text="Parámetro (a):", style="Card.TLabel", font=self.font_bold).pack(anchor='w', padx=20, pady=(10,0))
+        coprimes = [1, 3, 5, 7, 9, 11, 15, 17, 19, 21, 23, 25]
+        a_in = ttk.Combobox(controls, values=coprimes, state="readonly"); a_in.pack(fill='x', padx=20, pady=5); a_in.set(5)
+        
+        ttk.Label(controls, text="Parámetro (b):", style="Card.TLabel", font=self.font_bold).pack(anchor='w', padx=20, pady=(10,0))
+        b_in = ttk.Entry(controls); b_in.pack(fill='x', padx=20, pady=5); b_in.insert(0, "8")
+        
+        mode, result_text, steps_tree = self._common_widgets(controls, output, ["Entrada", "Cálculo", "Salida"])
+
+        def execute():
+            try:
+                b_val = int(b_in.get())
+                if b_val < 0:
+                    raise ValueError("El parámetro 'b' no puede ser negativo.")
+            except ValueError as e: 
+                messagebox.showerror("Error de Entrada", f"Valor inválido para 'b'.\n{e}")
+                return
+            text, key, decrypt = text_in.get("1.0", "end-1c"), (int(a_in.get()), b_val), mode.get()=='dec'
+            runner.submit(lambda job: self.result_cache.call('affine', (key, decrypt), text,
+                                                             lambda: CriptoMath.run_cipher(text, 'affine', key, decrypt, trace='lazy', progress=job.report)),
+                          self._output_callback(result_text, steps_tree))
+        
+        exec_btn = ttk.Button(controls, text="Ejecutar", command=execute)
+        exec_btn.pack(fill='x', side='bottom', padx=20, pady=20)
+        runner = self._create_job_runner(controls, exec_btn)
+        self._add_file_button(controls, mode, 'affine', lambda: (int(a_in.get()), int(b_in.get())), runner)
+
+    def _setup_vigenere_ui(self, controls, output):
+        ttk.Label(controls, text="Texto:", style="Card.TLabel", font=self.font_bold).pack(anchor='w', padx=20)
+        text_in = tk.Text(controls, height=5, font=self.font_normal, relief='solid', borderwidth=1, highlightthickness=1)
+        text_in.pack(fill='x', padx=20, pady=5); text_in.insert("1.0", "ATTACK AT DAWN")
+
+        ttk.Label(controls, text="Llave (k):", style="Card.TLabel", font=self.font_bold).pack(anchor='w', padx=20, pady=(10,0))
+        key_in = ttk.Entry(controls); key_in.pack(fill='x', padx=20, pady=5); key_in.insert(0, "LEMON")
+
+        mode, result_text, steps_tree = self._common_widgets(controls, output, ["Entrada", "Llave", "Shift", "Cálculo", "Salida"])
+
+        def execute():
+            text, key, decrypt = text_in.get("1.0", "end-1c"), key_in.get(), mode.get()=='dec'
+            runner.submit(lambda job: self.result_cache.call('vigenere', (key, decrypt), text,
+                                                             lambda: CriptoMath.run_cipher(text, 'vigenere', key, decrypt, trace='lazy', progress=job.report)),
+                          self._output_callback(result_text, steps_tree))
+        
+        exec_btn = ttk.Button(controls, text="Ejecutar", command=execute)
+        exec_btn.pack(fill='x', side='bottom', padx=20, pady=20)
+        runner = self._create_job_runner(controls, exec_btn)
+        self._add_file_button(controls, mode, 'vigenere', key_in.get, runner)
+
+    def _setup_vigenere_break_ui(self, controls, output):
+        ttk.Label(controls, text="Texto cifrado:", style="Card.TLabel", font=self.font_bold).pack(anchor='w', padx=20)
+        text_in = tk.Text(controls, height=8, font=self.font_normal, relief='solid', borderwidth=1, highlightthickness=1)
+        text_in.pack(fill='x', padx=20, pady=5)
+        text_in.insert("1.0", "TX IOF ELQ PRDX AT GTQQG, VE AMG GSI ICEDX AT GTQQG, VE AMG GSI MUR ZJ IWFOSY, WG HEE HUP ESS BQ "
+                              "JACYTWTBRDW, UH JLW FVR PTAQU ZJ NSYTIR, WG HEE HUP IBCPS SR WANVQRHWMFM, VE AMG GSI ESNDSZ CS "
+                              "WMSVG, TX IOF ELQ GRLWAB BQ HMFXYIEG, VE AMG GSI EDETRS CS SSBS, VE AMG GSI IWAEID CS OIEDNTV.")
+
+        languages = {"Inglés": 'en', "Español": 'es'}
+        ttk.Label(controls, text="Idioma del mensaje:", style="Card.TLabel", font=self.font_bold).pack(anchor='w', padx=20, pady=(10,0))
+        lang_in = ttk.Combobox(controls, values=list(languages), state="readonly"); lang_in.pack(fill='x', padx=20, pady=5); lang_in.set("Inglés")
+        max_in = self._create_labeled_entry(controls, "Longitud máx.:", "20")
+
+        _, result_text, steps_tree = self._common_widgets(controls, output, ["Longitud", "IC medio", "Votos Kasiski", "Evidencia IC+Kasiski", "Llave por χ²", "χ² por letra"], show_mode=False)
+
+        def show(res):
+            ranking = ", ".join(f"{c['key']} ({c['score']:.3f})" for c in res['candidates'])
+            self._show_result(result_text, f"Llave: {res['key']}  |  Candidatas: {ranking}\n{res['result']}")
+            self._update_tree(steps_tree, res['steps'])
+
+        def analyze(read_text):
+            try:
+                max_length, language = int(max_in.get()), languages[lang_in.get()]
+                if max_length < 1: raise ValueError("La longitud máxima debe ser al menos 1.")
+            except ValueError as e:
+                messagebox.showerror("Error de Entrada", str(e))
+                return
+            runner.submit(lambda job: CriptoMath.break_vigenere(read_text(), max_length, language, progress=job.report), show)
+
+        def analyze_file():
+            path = filedialog.askopenfilename(title="Archivo cifrado")
+            if not path: return
+            def read_text():
+                with open(path, encoding='utf-8', errors='surrogateescape', newline='') as f:
+                    return f.read()
+            analyze(read_text)
+
+        exec_btn = ttk.Button(controls, text="Analizar", command=lambda: analyze(lambda text=text_in.get("1.0", "end-1c"): text))
+        exec_btn.pack(fill='x', side='bottom', padx=20, pady=20)
+        runner = self._create_job_runner(controls, exec_btn)
+        ttk.Button(controls, text="Analizar Archivo...", command=analyze_file).pack(fill='x', side='bottom', padx=20)
+
+    def _setup_brute_force_ui(self, controls, output):
+        ttk.Label(controls, text="Texto cifrado:", style="Card.TLabel", font=self.font_bold).pack(anchor='w', padx=20)
+        text_in = tk.Text(controls, height=6, font=self.font_normal, relief='solid', borderwidth=1, highlightthickness=1)
+        text_in.pack(fill='x', padx=20, pady=5); text_in.insert("1.0", "WZ OIU ZRC NCUZ AH ZWQCU, WZ OIU ZRC OAPUZ AH ZWQCU, WZ OIU ZRC IMC AH OWUXAQ, WZ OIU ZRC IMC AH HAALWURVCUU.")
+
+        ciphers = {"César (26 llaves)": 'caesar', "Afín (312 llaves)": 'affine'}
+        languages = {"Inglés": 'en', "Español": 'es'}
+        ttk.Label(controls, text="Cifrado:", style="Card.TLabel", font=self.font_bold).pack(anchor='w', padx=20, pady=(10,0))
+        cipher_in = ttk.Combobox(controls, values=list(ciphers), state="readonly"); cipher_in.pack(fill='x', padx=20, pady=5); cipher_in.set("Afín (312 llaves)")
+        ttk.Label(controls, text="Idioma del mensaje:", style="Card.TLabel", font=self.font_bold).pack(anchor='w', padx=20, pady=(10,0))
+        lang_in = ttk.Combobox(controls, values=list(languages), state="readonly"); lang_in.pack(fill='x', padx=20, pady=5); lang_in.set("Inglés")
+        top_in = self._create_labeled_entry(controls, "Mejores (k):", "10")
+
+        _, result_text, steps_tree = self._common_widgets(controls, output, ["Puesto", "Llave", "χ² por letra", "Vista previa"], show_mode=False)
+
+        def show(res):
+            self._show_result(result_text, f"Llave: {res['key']}\n{res['result']}")
+            self._update_tree(steps_tree, res['steps'])
+
+        def execute():
+            try:
+                top = int(top_in.get())
+                if top < 1: raise ValueError("k debe ser al menos 1.")
+            except ValueError as e:
+                messagebox.showerror("Error de Entrada", str(e))
+                return
+            text, cipher, language = text_in.get("1.0", "end-1c"), ciphers[cipher_in.get()], languages[lang_in.get()]
+            runner.submit(lambda job: self.result_cache.call('brute_force', (cipher, top, language), text,
+                                                             lambda: CriptoMath.brute_force(text, cipher, top, language, progress=job.report)), show)
+
+        exec_btn = ttk.Button(controls, text="Atacar", command=execute)
+        exec_btn.pack(fill='x', side='bottom', padx=20, pady=20)
+        runner = self._create_job_runner(controls, exec_btn)
+
+    def _setup_otp_ui(self, controls, output):
+        ttk.Label(controls, text="Mensaje:", style="Card.TLabel", font=self.font_bold).pack(anchor='w', padx=20)
+        text_in = tk.Text(controls, height=5, font=self.font_normal, relief='solid', borderwidth=1, highlightthickness=1)
+        text_in.pack(fill='x', padx=20, pady=5); text_in.insert("1.0", "SECRET MESSAGE")
+
+        ttk.Label(controls, text="Llave (k):", style="Card.TLabel", font=self.font_bold).pack(anchor='w', padx=20, pady=(10,0))
+        key_in = ttk.Entry(controls); key_in.pack(fill='x', padx=20, pady=5)
+        
+        val_label = ttk.Label(controls, font=self.font_small, style="Card.TLabel"); val_label.pack(anchor='w', padx=20)
+
+        exec_btn = ttk.Button(controls, text="Ejecutar")
+        text_letters = TextLetterCounter(text_in)
+        
+        def validate(*args):
+            text_len = text_letters.count
+            key_len = sum(map(str.isalpha, key_in.get()))
+            if text_len == 0 and key_len == 0:
+                val_label.config(text="")
+                exec_btn.config(state="disabled")
+                return
+            if text_len == key_len:
+                val_label.config(text=f"Correcto: Longitudes coinciden ({text_len})", style="Success.TLabel")
+                exec_btn.config(state="normal")
+            else:
+                val_label.config(text=f"Error: Longitudes deben ser iguales (M: {text_len}, K: {key_len})", style="Error.TLabel")
+                exec_btn.config(state="disabled")
+        
+        delayed_validate = Debouncer(self, self.VALIDATION_DELAY_MS, validate)
+        text_in.bind("<KeyRelease>", delayed_validate); key_in.bind("<KeyRelease>", delayed_validate)
+        
+        def generate_key():
+            new_key = CriptoMath.generate_otp_key(text_letters.count)
+            key_in.delete(0, tk.END); key_in.insert(0, new_key); validate()
+
+        def generate_key_file():
+            msg_path = filedialog.askopenfilename(title="Mensaje para el que se genera la llave")
+            if not msg_path: return
+            key_path = filedialog.asksaveasfilename(title="Archivo de llave")
+            if not key_path: return
+            # Dos fases con su propio progreso: contar las letras del mensaje y escribir la llave
+            def work(job):
+                length = CriptoMath.count_file_letters(msg_path, progress=job.report)
+                return self._write_job(key_path, lambda: CriptoMath.generate_otp_key_file(key_path, length, progress=job.report))
+            runner.submit(work, lambda total: messagebox.showinfo("Llave generada", f"{total} letras escritas en:\n{key_path}"))
+
+        def ask_key_file():
+            path = filedialog.askopenfilename(title="Archivo de llave")
+            if not path: raise ValueError("No se seleccionó un archivo de llave.")
+            return path
+            
+        ttk.Button(controls, text="Generar Llave Aleatoria", command=generate_key).pack(fill='x', padx=20, pady=10)
+        ttk.Button(controls, text="Generar Archivo de Llave...", command=generate_key_file).pack(fill='x', padx=20)
+
+        mode, result_text, steps_tree = self._common_widgets(controls, output, ["Entrada", "Llave", "Shift", "Cálculo", "Salida"])
+
+        def execute():
+            text, key, decrypt = text_in.get("1.0", "end-1c"), key_in.get(), mode.get()=='dec'
+            runner.submit(lambda job: self.result_cache.call('otp', (key, decrypt), text,
+                                                             lambda: CriptoMath.run_cipher(text, 'otp', key, decrypt, trace='lazy', progress=job.report)),
+                          self._output_callback(result_text, steps_tree))
+        
+        exec_btn.config(command=execute); exec_btn.pack(fill='x', side='bottom', padx=20, pady=20)
+        runner = self._create_job_runner(controls, exec_btn, on_idle=validate)
+        self._add_file_button(controls, mode, 'otp', ask_key_file, runner)
+        validate()
+
+    def _setup_rsa_ui(self, controls, output):
+        # Frame de Generación
+        gen_frame = ttk.Frame(controls, style="Card.TFrame")
+        gen_frame.pack(fill='x', padx=20, pady=(0,10))
+        ttk.Label(gen_frame, text="1. Generación de Claves", style="Card.TLabel", font=self.font_bold).pack(anchor='w',pady=5)
+        
+        p_in = self._create_labeled_entry(gen_frame, "Primo (p):", "61")
+        q_in = self._create_labeled_entry(gen_frame, "Primo (q):", "53")
+        e_in = self._create_labeled_entry(gen_frame, "Exponente (e):", "17")
+        val_label = ttk.Label(gen_frame, font=self.font_small, style="Card.TLabel"); val_label.pack(anchor='w', pady=5)
+        
+        gen_btn = ttk.Button(gen_frame, text="Generar y Validar Claves")
+        gen_btn.pack(fill='x', pady=5)
+
+        bits_frame = ttk.Frame(gen_frame, style="Card.TFrame"); bits_frame.pack(fill='x', pady=(0,5))
+        bits_in = ttk.Combobox(bits_frame, values=[512, 1024, 2048, 3072], state="readonly", width=6); bits_in.set(2048)
+        bits_in.pack(side='left')
+        random_btn = ttk.Button(bits_frame, text="Generar Clave de N bits")
+        random_btn.pack(side='left', fill='x', expand=True, padx=(5,0))
+        
+        pub_key_out = self._create_labeled_entry(gen_frame, "Clave Pública (N,e):", "", readonly=True)
+        priv_key_out = self._create_labeled_entry(gen_frame, "Clave Privada (d):", "", readonly=True)
+
+        # Frame de Operación
+        op_frame = ttk.Frame(controls, style="Card.TFrame")
+        op_frame.pack(fill='x', expand=True, padx=20)
+        ttk.Label(op_frame, text="2. Operación", style="Card.TLabel", font=self.font_bold).pack(anchor='w', pady=5)
+        
+        ttk.Label(op_frame, text="Mensaje / Cifrado:", style="Card.TLabel").pack(anchor='w')
+        text_in = tk.Text(op_frame, height=4, font=self.font_normal, relief='solid', borderwidth=1, highlightthickness=1)
+        text_in.pack(fill='x', pady=5); text_in.insert("1.0", "RSA ENCRYPTED")
+
+        mode, result_text, steps_tree = self._common_widgets(op_frame, output, ["Entrada", "Cálculo", "Resultado"], show_mode=True)
+        use_crt = tk.BooleanVar(value=True)
+        ttk.Checkbutton(op_frame, text="Descifrar con TCR (p, q)", variable=use_crt).pack(anchor='w', pady=(0,5))
+        block_mode = tk.BooleanVar(value=False)
+        ttk.Checkbutton(op_frame, text="Cifrar por bloques (UTF-8)", variable=block_mode).pack(anchor='w', pady=(0,5))
+        # El contenedor binario no cabe en un widget de texto: se ofrece en base64
+        formats = {"Decimal": 'decimal', "Base64 (contenedor binario)": 'base64'}
+        ttk.Label(op_frame, text="Formato del cifrado:", style="Card.TLabel").pack(anchor='w')
+        format_in = ttk.Combobox(op_frame, values=list(formats), state="readonly"); format_in.pack(fill='x', pady=(0,5)); format_in.set("Decimal")
+        exec_btn = ttk.Button(controls, text="Ejecutar", state='disabled')
+        exec_btn.pack(fill='x', side='bottom', padx=20, pady=20)
+        runner = self._create_job_runner(controls, exec_btn, on_idle=lambda: validate_and_generate())
+        
+        rsa_params = {}
+        prime_cache = {}
+        def is_prime(n):
+            # Caché por valor: al teclear solo cambia uno de p y q a la vez
+            if n not in prime_cache:
+                if len(prime_cache) >= 256: prime_cache.clear()
+                prime_cache[n] = CriptoMath.is_prime(n)
+            return prime_cache[n]
+
+        def validate_and_generate():
+            try:
+                p, q, e = int(p_in.get()), int(q_in.get()), int(e_in.get())
+                if not is_prime(p): raise ValueError(f"p={p} no es primo.")
+                if not is_prime(q): raise ValueError(f"q={q} no es primo.")
+                if p == q: raise ValueError("p y q no pueden ser iguales.")
+                phi_N = (p-1)*(q-1)
+                if not (1 < e < phi_N): raise ValueError(f"e={e} debe estar entre 1 y φ(N)={phi_N}.")
+                if CriptoMath.mcd(e, phi_N) != 1: raise ValueError(f"e={e} no es coprimo con φ(N)={phi_N}.")
+                
+                val_label.config(text="✓ Parámetros válidos.", style="Success.TLabel")
+                N = p * q
+                priv = RSAPrivateKey(p, q, e)
+                d = priv.d
+                rsa_params.update({'N': N, 'e': e, 'd': d, 'priv': priv})
+                
+                self._set_readonly_entry(pub_key_out, f"({N}, {e})")
+                self._set_readonly_entry(priv_key_out, str(d))
+                exec_btn.config(state='normal')
+
+            except Exception as ex:
+                val_label.config(text=f"Error: {ex}", style="Error.TLabel")
+                self._set_readonly_entry(pub_key_out, "")
+                self._set_readonly_entry(priv_key_out, "")
+                rsa_params.clear()
+                exec_btn.config(state='disabled')
+
+        gen_btn.config(command=validate_and_generate)
+
+        def generate_random_key():
+            def fill_entries(priv):
+                for entry, value in [(p_in, priv.p), (q_in, priv.q), (e_in, priv.e)]:
+                    entry.delete(0, tk.END); entry.insert(0, str(value))
+                # generate_rsa_keypair ya probó p y q: se evita repetir Miller-Rabin en el hilo de Tk
+                prime_cache[priv.p] = prime_cache[priv.q] = True
+                validate_and_generate()
+
+            bits = int(bits_in.get())
+            runner.submit(lambda job: CriptoMath.generate_rsa_keypair(bits, progress=job.report), fill_entries)
+
+        random_btn.config(command=generate_random_key)
+        delayed_validate = Debouncer(self, self.VALIDATION_DELAY_MS, validate_and_generate)
+        def on_key(event):
+            # rsa_params aún tiene la llave anterior: Ejecutar espera a la validación diferida
+            exec_btn.config(state='disabled')
+            delayed_validate(event)
+        for entry in [p_in, q_in, e_in]:
+            entry.bind("<KeyRelease>", on_key)
+
+        def execute():
+            if mode.get() == 'enc':
+                key = rsa_params['e']
+            else:
+                key = rsa_params['priv'] if use_crt.get() else rsa_params['d']
+            text, N, op, block = text_in.get("1.0", "end-1c"), rsa_params['N'], mode.get(), block_mode.get()
+            # Al descifrar el formato se detecta a partir del texto
+            fmt = formats[format_in.get()] if op == 'enc' else 'decimal'
+            # RSAPrivateKey se compara por sus componentes, no por identidad
+            params = (N, key if isinstance(key, int) else ('crt', key.p, key.q, key.e), op, block, fmt)
+            runner.submit(lambda job: self.result_cache.call('rsa', params, text,
+                                                             lambda: CriptoMath.rsa_cipher(text, N, key, op, trace='lazy', block=block, progress=job.report, fmt=fmt)),
+                          self._output_callback(result_text, steps_tree))
+            
+        exec_btn.config(command=execute)
+        validate_and_generate()
+        
+    def _setup_euclides_ui(self, controls, output):
+        a_in = self._create_labeled_entry(controls, "Entero (a):", "391")
+        b_in = self._create_labeled_entry(controls, "Entero (b):", "299")
+        
+        _, result_text, steps_tree = self._common_widgets(controls, output, ["Paso de División", "Identidad de Bézout"], show_mode=False)
+        result_text.config(wraplength=350, justify='left')
+
+        def execute():
+            try:
+                a, b = int(a_in.get()), int(b_in.get())
+            except ValueError as e:
+                messagebox.showerror("Error", str(e))
+                return
+            runner.submit(lambda job: self.result_cache.call('euclides', (), (a, b), lambda: CriptoMath.euclides_algorithm(a, b)),
+                          self._output_callback(result_text, steps_tree))
+        
+        exec_btn = ttk.Button(controls, text="Calcular", command=execute)
+        exec_btn.pack(fill='x', side='bottom', padx=20, pady=20)
+        runner = self._create_job_runner(controls, exec_btn)
+        
+    def _setup_inverso_ui(self, controls, output):
+        a_in = self._create_labeled_entry(controls, "Entero (a):", "17")
+        m_in = self._create_labeled_entry(controls, "Módulo (m):", "20")
+        val_label = ttk.Label(controls, font=self.font_small, style="Card.TLabel"); val_label.pack(anchor='w', padx=20)
+        
+        exec_btn = ttk.Button(controls, text="Calcular Inverso")
+
+        def validate(*args):
+            try:
+                a, m = int(a_in.get()), int(m_in.get())
+                if m <= 1: raise ValueError("Módulo debe ser > 1.")
+                g = CriptoMath.mcd(a,m)
+                if g == 1:
+                    val_label.config(text=f"✓ mcd({a},{m}) = 1. El inverso existe.", style="Success.TLabel")
+                    exec_btn.config(state="normal")
+                else:
+                    val_label.config(text=f"✖ mcd({a},{m}) = {g}. NO existe.", style="Error.TLabel")
+                    exec_btn.config(state="disabled")
+            except (ValueError, TypeError) as e:
+                val_label.config(text=f"Error: {e}", style="Error.TLabel")
+                exec_btn.config(state="disabled")
+
+        a_in.bind("<KeyRelease>", validate); m_in.bind("<KeyRelease>", validate)
+        
+        _, result_text, steps_tree = self._common_widgets(controls, output, ["Paso", "Cálculo", "Resultado"], show_mode=False)
+
+        def execute():
+            try:
+                a, m = int(a_in.get()), int(m_in.get())
+            except ValueError as e:
+                messagebox.showerror("Error", str(e))
+                return
+
+            def work(job):
+                inv = CriptoMath.modinv(a, m)
+                g, x, y = CriptoMath.egcd(a,m)
+                steps = [("Verificar", f"mcd({a},{m})", g), ("Euclides Ext.", f"{a}({x})+{m}({y})={g}", f"x={x}"), ("Inverso", f"x mod m", inv)]
+                return {'result': f"{a}⁻¹ ≡ {inv} (mod {m})", 'steps': steps}
+
+            runner.submit(work, self._output_callback(result_text, steps_tree))
+        
+        exec_btn.config(command=execute); exec_btn.pack(fill='x', side='bottom', padx=20, pady=20)
+        runner = self._create_job_runner(controls, exec_btn, on_idle=validate)
+        validate()
+        
+    def _setup_tcr_ui(self, controls, output):
+        ttk.Label(controls, text="Sistema de Congruencias:", style="Card.TLabel", font=self.font_bold).pack(anchor='w', padx=20)
+        
+        rows_frame = ttk.Frame(controls, style="Card.TFrame"); rows_frame.pack(fill='x', padx=20, pady=5)
+        val_label = ttk.Label(controls, font=self.font_small, style="Card.TLabel"); val_label.pack(anchor='w', padx=20)
+        tcr_rows = []
+
+        def validate_tcr():
+            try:
+                # CORRECCIÓN: Ahora se obtiene de la tupla correcta
+                moduli = [int(n.get()) for f, r, n in tcr_rows if n.get()]
+                if len(moduli) < 2:
+                    val_label.config(text="")
+                    return True
+                
+                for n in moduli:
+                    if n <= 1: raise ValueError(f"Módulo {n} debe ser > 1.")
+                pair = CriptoMath.find_non_coprime(moduli)
+                if pair is None:
+                    val_label.config(text="✓ Módulos son coprimos en pares.", style="Success.TLabel")
+                else:
+                    val_label.config(text=f"Aviso: mcd({pair[0]}, {pair[1]}) ≠ 1; se resolverá módulo el mcm.", style="Card.TLabel")
+                return True
+            except Exception as e:
+                val_label.config(text=f"Error: {e}", style="Error.TLabel")
+                return False
+
+        def remove_row(row_tuple):
+            if len(tcr_rows) <= 2:
+                messagebox.showwarning("Aviso", "Se requieren al menos dos congruencias.")
+                return
+            frame, r_entry, n_entry = row_tuple
+            tcr_rows.remove(row_tuple)
+            frame.destroy()
+            validate_tcr()
+
+        def add_row(r_val="", n_val=""):
+            row_frame = ttk.Frame(rows_frame, style="Card.TFrame")
+            row_frame.pack(fill='x', pady=2)
+            
+            ttk.Label(row_frame, text="n ≡", style="Card.TLabel").pack(side='left', padx=2)
+            r = ttk.Entry(row_frame, width=5); r.pack(side='left'); r.insert(0, r_val)
+            ttk.Label(row_frame, text="(mod", style="Card.TLabel").pack(side='left', padx=2)
+            n = ttk.Entry(row_frame, width=5); n.pack(side='left'); n.insert(0, n_val)
+            ttk.Label(row_frame, text=")", style="Card.TLabel").pack(side='left', padx=2)
+            
+            # CORRECCIÓN: La tupla ahora incluye el frame para poder eliminarlo
+            row_tuple = (row_frame, r, n)
+            remove_btn = ttk.Button(row_frame, text="-", width=2, command=lambda t=row_tuple: remove_row(t))
+            remove_btn.pack(side='right', padx=(5,0))
+
+            r.bind("<KeyRelease>", lambda e: validate_tcr())
+            n.bind("<KeyRelease>", lambda e: validate_tcr())
+            
+            tcr_rows.append(row_tuple)
+            validate_tcr()
+            
+        ttk.Button(controls, text="Añadir Congruencia", command=lambda: add_row()).pack(fill='x', padx=20, pady=5)
+        add_row("2", "3"); add_row("3", "5"); add_row("2", "7")
+        
+        _, result_text, steps_tree = self._common_widgets(controls, output, ["Paso", "Cálculo", "Resultado"], show_mode=False)
+
+        def execute():
+            if not validate_tcr():
+                messagebox.showerror("Error de Validación", "Revise los módulos antes de continuar.")
+                return
+            try:
+                congruences = [(int(r.get()), int(n.get())) for f, r, n in tcr_rows]
+            except ValueError as e:
+                messagebox.showerror("Error", str(e))
+                return
+            runner.submit(lambda job: self.result_cache.call('crt', (), tuple(congruences),
+                                                             lambda: CriptoMath.chinese_remainder_theorem(congruences, trace='lazy')),
+                          self._output_callback(result_text, steps_tree))
+
+        exec_btn = ttk.Button(controls, text="Resolver Sistema", command=execute)
+        exec_btn.pack(fill='x', side='bottom', padx=20, pady=20)
+        runner = self._create_job_runner(controls, exec_btn)
+
+
+    # --- Métodos de Ayuda para UI ---
+
+    def _common_widgets(self, controls, output, tree_cols, show_mode=True):
+        mode = tk.StringVar(value="enc")
+        if show_mode:
+            mode_frame = ttk.Frame(controls, style="Card.TFrame")
+            mode_frame.pack(anchor='w', padx=20, pady=10)
+            ttk.Radiobutton(mode_frame, text="Encriptar", variable=mode, value="enc").pack(side='left')
+            ttk.Radiobutton(mode_frame, text="Desencriptar", variable=mode, value="dec").pack(side='left', padx=10)
+        
+        ttk.Label(output, text="Resultado Final:", font=self.font_bold).pack(anchor='w', padx=10, pady=(0,5))
+        result_text = ttk.Label(output, text="-", style="Result.TLabel", wraplength=700); result_text.pack(anchor='w', padx=10, pady=(0,5))
+        ttk.Button(output, text="Copiar resultado completo", command=lambda: self._copy_result(result_text)).pack(anchor='w', padx=10, pady=(0,10))
+        ttk.Label(output, text="Proceso Matemático:", font=self.font_bold).pack(anchor='w', padx=10, pady=(10,5))
+        
+        tree_frame = ttk.Frame(output); tree_frame.pack(fill='both', expand=True, padx=10, pady=(0,10))
+        tree = self._create_treeview(tree_frame, tree_cols)
+        
+        return mode, result_text, tree
+
+    def _create_job_runner(self, controls, exec_btn, on_idle=None):
+        # Línea de estado con el tiempo y los contadores de la última operación
+        status_frame = ttk.Frame(controls, style="Card.TFrame"); status_frame.pack(fill='x', side='bottom', padx=20)
+        status = ttk.Label(status_frame, text="", font=self.font_small, style="Card.TLabel", wraplength=330, justify='left')
+        status.pack(side='left', fill='x', expand=True)
+        profile = tk.BooleanVar(value=False)
+        ttk.Checkbutton(status_frame, text="Perfilar", variable=profile).pack(side='right')
+        job_frame = ttk.Frame(controls, style="Card.TFrame"); job_frame.pack(fill='x', side='bottom', padx=20)
+        progress_bar = ttk.Progressbar(job_frame, mode='determinate', maximum=100)
+        progress_bar.pack(side='left', fill='x', expand=True)
+        cancel_btn = ttk.Button(job_frame, text="Cancelar", state='disabled')
+        cancel_btn.pack(side='left', padx=(5,0))
+        runner = JobRunner(self, exec_btn, progress_bar, cancel_btn, on_idle, self._building_tab, status, profile)
+        cancel_btn.config(command=runner.cancel)
+        return runner
+
+    def _show_profile(self, name, report):
+        window = tk.Toplevel(self); window.title(f"Perfil: {name}")
+        text = tk.Text(window, width=110, height=35, font=("Consolas", 9), wrap='none')
+        text.pack(fill='both', expand=True); text.insert("1.0", report); text.config(state='disabled')
+
+    def _output_callback(self, result_text, steps_tree):
+        def show(res):
+            self._show_result(result_text, res['result'])
+            self._update_tree(steps_tree, res['steps'])
+        return show
+
+    @staticmethod
+    def _write_job(path, write):
+        # Ejecuta write() en el hilo de trabajo; si se cancela, borra el archivo a medio escribir
+        try:
+            return write()
+        except JobCancelled:
+            try: os.remove(path)
+            except OSError: pass
+            raise
+
+    def _add_file_button(self, controls, mode, cipher, get_key, runner):
+        # Los diálogos se abren en el hilo de Tk; el archivo se procesa en el JobRunner de la
+        # pestaña, con barra de progreso y cancelación
+        def encrypt_file():
+            try:
+                key = get_key()
+                in_path = filedialog.askopenfilename(title="Archivo de entrada")
+                if not in_path: return
+                out_path = filedialog.asksaveasfilename(title="Archivo de salida")
+                if not out_path: return
+            except Exception as e:
+                messagebox.showerror("Error", str(e))
+                return
+            decrypt = mode.get()=='dec'
+            runner.submit(lambda job: self._write_job(out_path, lambda: CriptoMath.encrypt_file(in_path, out_path, cipher, key, decrypt, progress=job.report)),
+                          lambda total: messagebox.showinfo("Archivo procesado", f"{total} caracteres escritos en:\n{out_path}"))
+
+        ttk.Button(controls, text="Procesar Archivo...", command=encrypt_file).pack(fill='x', side='bottom', padx=20)
+
+    def _create_labeled_entry(self, parent, label_text, default_value, readonly=False):
+        frame = ttk.Frame(parent, style="Card.TFrame")
+        frame.pack(fill='x', padx=10, pady=2)
+        ttk.Label(frame, text=label_text, style="Card.TLabel", width=15).pack(side='left')
+        entry = ttk.Entry(frame, state='readonly' if readonly else 'normal')
+        entry.pack(side='left', fill='x', expand=True)
+        if default_value: entry.insert(0, default_value)
+        return entry
+        
+    def _set_readonly_entry(self, entry, value):
+        entry.config(state='normal')
+        entry.delete(0, tk.END)
+        entry.insert(0, value)
+        entry.config(state='readonly')
+
+    def _create_treeview(self, parent, columns):
+        return StepView(parent, columns)
+
+    def _update_tree(self, view, data):
+        view.set_data(data)
+
+    def _show_result(self, result_label, text):
+        # Los resultados enormes se truncan en la etiqueta; el texto completo queda disponible
+        # para el botón de copiar.
+        self._full_results[str(result_label)] = text
+        if len(text) > self.RESULT_PREVIEW:
+            text = f"{text[:self.RESULT_PREVIEW]}… ({len(text)} caracteres)"
+        result_label.config(text=text)
+
+    def _copy_result(self, result_label):
+        self.clipboard_clear()
+        self.clipboard_append(self._full_results.get(str(result_label), ""))
+
+def main(timing_report=False):
+    app = CriptoSuiteApp(timing_report)
+    app.mainloop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+import os
+import random
+import string
+import tempfile
+import unittest
+
+import criptosuite
+from criptosuite import CriptoMath
+
+# =================================================================================================
+# Equivalencia entre el camino vectorizado (NumPy) de Vigenère / OTP y el camino puro de Python.
+# Cada caso se calcula dos veces: con NumPy disponible y forzando criptosuite._np = None, y ambos
+# se comparan con el bucle original carácter a carácter, que no comparte tablas, preparación de
+# llave ni fragmentación con ninguno de los dos caminos.
+# =================================================================================================
+SIZE = CriptoMath.NUMPY_MIN_SIZE
+
+def _text(size, rng, alphabet=string.ascii_letters + string.digits + " .,;\n\t"):
+    return ''.join(rng.choice(alphabet) for _ in range(size))
+
+def reference_vigenere(text, key, decrypt=False):
+    # Implementación original (una llamada a César por letra); devuelve (resultado, pasos)
+    clean_key = ''.join(filter(str.isalpha, key)).upper()
+    if not clean_key: raise ValueError("La llave debe contener al menos una letra.")
+    result, steps, key_index = '', [], 0
+    for char in text:
+        if char.isalpha():
+            k_char = clean_key[key_index % len(clean_key)]
+            k_shift = CriptoMath.ALPHABET.find(k_char)
+            if char.upper() in CriptoMath.ALPHABET:
+                base = 65 if char.isupper() else 97
+                P = ord(char) - base
+                C = (P + (-k_shift if decrypt else k_shift)) % 26
+                new_char = chr(base + C)
+                calc, out = f"({P} {'-' if decrypt else '+'} {k_shift}) mod 26", f"'{new_char}' (C={C})"
+            else:
+                new_char, calc, out = char, 'No es una letra', f"'{char}'"
+            result += new_char
+            steps.append((f"'{char}'", f"'{k_char}'", k_shift, calc, out))
+            key_index += 1
+        else:
+            result += char
+            steps.append((f"'{char}'", 'N/A', 'N/A', 'No es una letra', f"'{char}'"))
+    return result, steps
+
+def reference_one_time_pad(text, key, decrypt=False):
+    clean_key = ''.join(filter(str.isalpha, key)).upper()
+    clean_text = ''.join(filter(str.isalpha, text))
+    if len(clean_key) != len(clean_text):
+        raise ValueError(f"La longitud del mensaje ({len(clean_text)}) y la llave ({len(clean_key)}) deben ser iguales.")
+    return reference_vigenere(text, key, decrypt)
+
+@unittest.skipIf(criptosuite._numpy() is None, "NumPy no está instalado")
+class NumpyEquivalenceTest(unittest.TestCase):
+    KEYS = ["LEMON", "k", "Clave Larga Con Espacios", "Lémon", "ßeta", "ıſ", "ÆBC"]
+
+    def setUp(self):
+        self.rng = random.Random(2024)
+
+    def both(self, func):
+        # Resultado con NumPy y sin él; restaura el módulo aunque la llamada falle
+        saved = criptosuite._np
+        try:
+            with_np = func()
+            criptosuite._np = None
+            without_np = func()
+        finally:
+            criptosuite._np = saved
+        return with_np, without_np
+
+    def assertSame(self, func, expected=None):
+        # Ambos caminos deben coincidir entre sí y, si se da, con el resultado de referencia
+        with_np, without_np = self.both(func)
+        self.assertEqual(with_np, without_np)
+        if expected is not None:
+            self.assertEqual(with_np, expected)
+        return with_np
+
+    def test_ascii_sizes_around_threshold(self):
+        for size in (0, 1, SIZE - 1, SIZE, SIZE + 1, 3 * SIZE + 17):
+            text = _text(size, self.rng)
+            for key in self.KEYS:
+                for decrypt in (False, True):
+                    with self.subTest(size=size, key=key, decrypt=decrypt):
+                        self.assertSame(lambda: CriptoMath.vigenere_cipher(text, key, decrypt, trace=False)['result'],
+                                        reference_vigenere(text, key, decrypt)[0])
+
+    def test_roundtrip(self):
+        text = _text(5 * SIZE, self.rng)
+        encrypted = CriptoMath.vigenere_cipher(text, "LEMON", trace=False)['result']
+        self.assertEqual(CriptoMath.vigenere_cipher(encrypted, "LEMON", True, trace=False)['result'], text)
+
+    def test_non_ascii_text(self):
+        # Las letras no ASCII (y las que solo cambian al pasar a mayúscula) avanzan la llave
+        alphabet = string.ascii_letters + " ñÑáéíóúü€ßıſﬅ\n"
+        for size in (SIZE - 1, SIZE, 2 * SIZE + 3):
+            text = _text(size, self.rng, alphabet)
+            for key in self.KEYS:
+                with self.subTest(size=size, key=key):
+                    self.assertSame(lambda: CriptoMath.vigenere_cipher(text, key, trace=False)['result'],
+                                    reference_vigenere(text, key)[0])
+
+    def test_chunk_boundaries(self):
+        # Fragmentos ASCII (NumPy) y no ASCII (puro) alternados: la posición de la llave
+        # debe continuar igual a través de cada frontera
+        ascii_part = _text(SIZE, self.rng)
+        text = ascii_part + "ñandú" + ascii_part + _text(SIZE // 2, self.rng) + "é" + ascii_part
+        for chunk_size in (SIZE - 1, SIZE, SIZE + 1, 2 * SIZE):
+            for key in ("LEMON", "Lémon"):
+                with self.subTest(chunk_size=chunk_size, key=key):
+                    self.assertSame(lambda: CriptoMath.run_cipher(text, 'vigenere', key, trace=False, chunk_size=chunk_size)['result'],
+                                    reference_vigenere(text, key)[0])
+
+    def test_traced_steps(self):
+        text = _text(SIZE + 5, self.rng) + "ñandú ßıſ"
+        for key in ("LEMON", "Lémon"):
+            with self.subTest(key=key):
+                self.assertSame(lambda: list(CriptoMath.vigenere_cipher(text, key)['steps']), reference_vigenere(text, key)[1])
+
+    def test_bytes_input(self):
+        text = _text(2 * SIZE + 1, self.rng)
+        data = text.encode('ascii')
+        for key in ("LEMON", "Lémon"):
+            with self.subTest(key=key):
+                self.assertSame(lambda: CriptoMath.vigenere_cipher(data, key, trace=False)['result'],
+                                reference_vigenere(text, key)[0].encode('ascii'))
+
+    def test_one_time_pad(self):
+        text = _text(3 * SIZE + 11, self.rng) + "ñandú"
+        key = CriptoMath.generate_otp_key(CriptoMath._count_letters(text))
+        for decrypt in (False, True):
+            with self.subTest(decrypt=decrypt):
+                self.assertSame(lambda: CriptoMath.one_time_pad_cipher(text, key, decrypt, trace=False)['result'],
+                                reference_one_time_pad(text, key, decrypt)[0])
+
+    def test_one_time_pad_key_file(self):
+        text = _text(3 * SIZE + 11, self.rng)
+        key = CriptoMath.generate_otp_key(CriptoMath._count_letters(text))
+        fd, pad_path = tempfile.mkstemp(suffix='.txt')
+        os.close(fd)
+        self.addCleanup(os.remove, pad_path)
+        with open(pad_path, 'w', encoding='ascii') as pad:
+            pad.write(key)
+        self.assertSame(lambda: CriptoMath.one_time_pad_cipher(text, None, trace=False, key_file=pad_path)['result'],
+                        reference_one_time_pad(text, key)[0])
+
+if __name__ == "__main__":
+    unittest.main()
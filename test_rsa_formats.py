@@ -0,0 +1,107 @@
+import base64
+import unittest
+
+from criptosuite import CriptoMath, RSAPrivateKey
+
+# =================================================================================================
+# Formatos persistentes del cifrado RSA: la lista decimal, el contenedor binario 'CSR1' (y su
+# versión base64) y el relleno 0x80 del modo por bloques. Los vectores fijos protegen los textos
+# cifrados ya guardados: si alguno cambia, el formato dejó de ser compatible.
+# =================================================================================================
+SMALL_N = 3233                          # 61 * 53: 12 bits, bloques de 2 bytes en el contenedor
+KEY = RSAPrivateKey(2**127 - 1, 2**89 - 1, 65537)
+N = KEY.N                               # 216 bits: 27 bytes por bloque cifrado, 26 de mensaje
+
+class RSAContainerTest(unittest.TestCase):
+    VALUES = [[], [0], [1, 3232], list(range(0, 3233, 97))]
+
+    def test_binary_vector(self):
+        expected = b'CSR1' + b'\x00\x00\x00\x0c' + b'\x00\x00\x00\x00\x00\x00\x00\x02' + b'\x00\x01' + b'\x0c\xa0'
+        self.assertEqual(CriptoMath.rsa_encode_blocks([1, 3232], SMALL_N, 'binary'), expected)
+        self.assertEqual(CriptoMath.rsa_encode_blocks([1, 3232], SMALL_N, 'base64'), base64.b64encode(expected).decode('ascii'))
+        self.assertEqual(CriptoMath.rsa_encode_blocks([1, 3232], SMALL_N, 'decimal'), "1,3232")
+
+    def test_roundtrip(self):
+        for values in self.VALUES:
+            for fmt in CriptoMath.RSA_FORMATS:
+                with self.subTest(values=len(values), fmt=fmt):
+                    encoded = CriptoMath.rsa_encode_blocks(values, SMALL_N, fmt)
+                    self.assertEqual(CriptoMath.rsa_decode_blocks(encoded, SMALL_N), values)
+
+    def test_buffer_inputs(self):
+        values = self.VALUES[-1]
+        data = CriptoMath.rsa_encode_blocks(values, SMALL_N, 'binary')
+        for buffer in (bytearray(data), memoryview(data), memoryview(b'\xff' + data)[1:]):
+            with self.subTest(type=type(buffer).__name__):
+                self.assertEqual(CriptoMath.rsa_decode_blocks(buffer, SMALL_N), values)
+
+    def test_base64_with_whitespace(self):
+        # Los archivos de texto suelen terminar en salto de línea
+        encoded = CriptoMath.rsa_encode_blocks([5, 7], SMALL_N, 'base64')
+        self.assertEqual(CriptoMath.rsa_decode_blocks(f"  {encoded}\n", SMALL_N), [5, 7])
+
+    def test_rejects_bad_magic(self):
+        data = CriptoMath.rsa_encode_blocks([1, 2], SMALL_N, 'binary')
+        with self.assertRaises(ValueError):
+            CriptoMath.rsa_decode_blocks(b'CSR2' + data[4:], SMALL_N)
+
+    def test_rejects_modulus_mismatch(self):
+        data = CriptoMath.rsa_encode_blocks([1, 2], SMALL_N, 'binary')
+        with self.assertRaisesRegex(ValueError, "12 bits"):
+            CriptoMath.rsa_decode_blocks(data, N)
+
+    def test_rejects_truncated(self):
+        data = CriptoMath.rsa_encode_blocks([1, 2, 3], SMALL_N, 'binary')
+        for broken in (data[:-1], data[:10], data[:4], data + b'\x00'):
+            with self.subTest(size=len(broken)):
+                with self.assertRaises(ValueError):
+                    CriptoMath.rsa_decode_blocks(broken, SMALL_N)
+
+    def test_rejects_invalid_text(self):
+        for text in ("Q1NS!!!", "1,dos,3"):
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    CriptoMath.rsa_decode_blocks(text, SMALL_N)
+
+class RSAPaddingTest(unittest.TestCase):
+    def test_padding_vectors(self):
+        # 0x80 y ceros hasta completar el último bloque; siempre hay al menos un byte de relleno
+        self.assertEqual(CriptoMath.rsa_pack_blocks(b'hi', SMALL_N), [0x68, 0x69, 0x80])
+        self.assertEqual(CriptoMath.rsa_pack_blocks(b'abc', 131071), [0x6162, 0x6380])
+        self.assertEqual(CriptoMath.rsa_pack_blocks(b'ab', 131071), [0x6162, 0x8000])
+        self.assertEqual(CriptoMath.rsa_pack_blocks(b'', 131071), [0x8000])
+
+    def test_roundtrip(self):
+        k = CriptoMath.rsa_block_size(N)
+        for size in (0, 1, k - 1, k, k + 1, 3 * k):
+            for tail in (b'', b'\x00', b'\x80', b'\x80\x00'):
+                data = bytes(range(size)) + tail
+                with self.subTest(size=size, tail=tail):
+                    blocks = CriptoMath.rsa_pack_blocks(data, N)
+                    self.assertTrue(all(0 <= m < N for m in blocks))
+                    self.assertEqual(CriptoMath.rsa_unpack_blocks(blocks, N), data)
+
+    def test_rejects_invalid_padding(self):
+        for blocks in ([0x6162, 0x6300], [0, 0], [], [1 << 16]):
+            with self.subTest(blocks=blocks):
+                with self.assertRaises(ValueError):
+                    CriptoMath.rsa_unpack_blocks(blocks, 131071)
+
+class RSACipherFormatTest(unittest.TestCase):
+    def test_roundtrip(self):
+        text = "Mensaje con ñ, € y 😀 " * 5
+        for block in (False, True):
+            for fmt in CriptoMath.RSA_FORMATS:
+                with self.subTest(block=block, fmt=fmt):
+                    encrypted = CriptoMath.rsa_cipher(text, N, KEY.e, 'enc', trace=False, block=block, fmt=fmt)['result']
+                    for key in (KEY, KEY.d):
+                        self.assertEqual(CriptoMath.rsa_cipher(encrypted, N, key, 'dec', trace=False, block=block)['result'], text)
+
+    def test_wrong_key_is_rejected(self):
+        # Con otro exponente los bloques descifrados no terminan en el relleno (o no caben)
+        encrypted = CriptoMath.rsa_cipher("hola", N, KEY.e, 'enc', trace=False, block=True, fmt='binary')['result']
+        with self.assertRaises(ValueError):
+            CriptoMath.rsa_cipher(encrypted, N, KEY.d + 2, 'dec', trace=False, block=True)
+
+if __name__ == "__main__":
+    unittest.main()